@@ -16,9 +16,12 @@ if "bpy" in locals():
 else:
     from . import spaceship_generator
 
+import random
+import time
+
 import bpy
 try:
-    from bpy.props import StringProperty, BoolProperty, IntProperty
+    from bpy.props import StringProperty, BoolProperty, IntProperty, FloatProperty
 except Exception:  # pragma: no cover - used for testing without Blender
     def StringProperty(*args, **kwargs):
         return None
@@ -28,6 +31,9 @@ except Exception:  # pragma: no cover - used for testing without Blender
 
     def IntProperty(*args, **kwargs):
         return None
+
+    def FloatProperty(*args, **kwargs):
+        return None
 try:
     from bpy.types import Operator
 except Exception:  # pragma: no cover - used for testing without Blender
@@ -51,6 +57,14 @@ class GenerateSpaceship(Operator):
     allow_vertical_symmetry    : BoolProperty(default=False, name='Allow Vertical Symmetry')
     apply_bevel_modifier       : BoolProperty(default=True,  name='Apply Bevel Modifier')
     assign_materials           : BoolProperty(default=True,  name='Assign Materials')
+    batch_extrusions           : BoolProperty(default=False, name='Batch Extrusions')
+    bake_uvs                   : BoolProperty(default=True,  name='Bake UVs')
+    hard_edge_angle            : FloatProperty(default=180.0, min=0.0, max=180.0, name='Hard Edge Angle')
+    collision_proxies          : BoolProperty(default=False, name='Collision Proxies')
+    collision_segments         : BoolProperty(default=False, name='Per-Segment Collision',
+                                              description='Add a collision proxy per hull segment; implies Collision Proxies')
+    cull_hidden_greebles       : BoolProperty(default=False, name='Cull Hidden Greebles')
+    texture_atlas              : BoolProperty(default=False, name='Texture Atlas')
 
     def execute(self, context):
         spaceship_generator.generate_spaceship(
@@ -64,17 +78,94 @@ class GenerateSpaceship(Operator):
             self.allow_horizontal_symmetry,
             self.allow_vertical_symmetry,
             self.apply_bevel_modifier,
-            self.assign_materials)
+            self.assign_materials,
+            batch_extrusions=self.batch_extrusions,
+            bake_uvs=self.bake_uvs,
+            hard_edge_angle=self.hard_edge_angle,
+            collision_proxies=self.collision_proxies,
+            collision_segments=self.collision_segments,
+            cull_hidden_greebles=self.cull_hidden_greebles,
+            texture_atlas=self.texture_atlas)
         return {'FINISHED'}
 
+class GenerateSpaceshipFleet(Operator):
+    """Generate a row of spaceships in the background without blocking the UI. Press Esc to stop."""
+    bl_idname = "mesh.generate_spaceship_fleet"
+    bl_label = "Spaceship Fleet"
+    bl_options = {'REGISTER'}
+
+    random_seed    : StringProperty(default='', name='Seed Prefix')
+    num_ships      : IntProperty(default=10, min=1, soft_max=1000, name='Ships')
+    spacing        : FloatProperty(default=8.0, min=0.0, name='Spacing')
+    time_budget_ms : IntProperty(default=20, min=1, soft_max=200, name='Milliseconds Per Tick')
+
+    def execute(self, context):
+        self._steps = None
+        self._random_state = None
+        self._num_done = 0
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.progress_begin(0, self.num_ships)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            return self.finish(context, {'CANCELLED'})
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        # Keep this fleet's random sequence separate from anything else that
+        # runs between ticks.
+        outer_random_state = random.getstate()
+        if self._random_state is not None:
+            random.setstate(self._random_state)
+        try:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+            while time.perf_counter() < deadline:
+                if self._num_done >= self.num_ships:
+                    return self.finish(context, {'FINISHED'})
+                if self._steps is None:
+                    seed = self.random_seed + str(self._num_done) if self.random_seed else ''
+                    self._steps = spaceship_generator.iter_generate_spaceship(seed)
+                try:
+                    next(self._steps)
+                except StopIteration as done:
+                    done.value.location.x = self._num_done * self.spacing
+                    self._steps = None
+                    self._num_done += 1
+                    context.window_manager.progress_update(self._num_done)
+        finally:
+            self._random_state = random.getstate()
+            random.setstate(outer_random_state)
+
+        if context.area:
+            context.area.header_text_set(
+                "Generating spaceship %d of %d (Esc to stop)" % (self._num_done + 1, self.num_ships))
+        return {'PASS_THROUGH'}
+
+    def finish(self, context, result):
+        if self._steps is not None:
+            self._steps.close()
+            self._steps = None
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        if context.area:
+            context.area.header_text_set(None)
+        return result
+
 def menu_func(self, context):
     self.layout.operator(GenerateSpaceship.bl_idname, text="Spaceship")
+    self.layout.operator(GenerateSpaceshipFleet.bl_idname, text="Spaceship Fleet")
 
 def register():
     bpy.utils.register_class(GenerateSpaceship)
+    bpy.utils.register_class(GenerateSpaceshipFleet)
     bpy.types.VIEW3D_MT_mesh_add.append(menu_func)
 
 def unregister():
+    bpy.utils.unregister_class(GenerateSpaceshipFleet)
     bpy.utils.unregister_class(GenerateSpaceship)
     bpy.types.VIEW3D_MT_mesh_add.remove(menu_func)
 
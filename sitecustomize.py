@@ -14,6 +14,7 @@ if "bpy" not in sys.modules:
     bpy.props.StringProperty = lambda *a, **k: None
     bpy.props.BoolProperty = lambda *a, **k: None
     bpy.props.IntProperty = lambda *a, **k: None
+    bpy.props.FloatProperty = lambda *a, **k: None
     bpy.types = _stub("bpy.types")
     bpy.types.Operator = object  # type: ignore
     bpy.__path__ = []  # mark as package
@@ -1,12 +1,23 @@
 """Spaceship generation package."""
 
-from .generator import generate_spaceship, generate_movie
+from .utils import addon_version
+
+__version__ = addon_version()
+
+from .fleet import ShipPlacement, assemble_fleet, run_fleet
+from .generator import generate_movie, generate_spaceship, iter_generate_spaceship
+from .profiling import MemoryProfiler
 from .utils import reset_scene, resource_path
 
 __all__ = [
+    "MemoryProfiler",
+    "ShipPlacement",
+    "assemble_fleet",
     "generate_spaceship",
     "generate_movie",
+    "iter_generate_spaceship",
     "reset_scene",
     "resource_path",
+    "run_fleet",
 ]
 
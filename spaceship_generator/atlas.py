@@ -0,0 +1,95 @@
+"""Channel-packed atlas of the hull textures.
+
+The hull materials sample ``hull_normal.png``, ``hull_lights_diffuse.png``
+and ``hull_lights_emit.png`` separately. The atlas packs what they use
+into one RGBA image so a single lookup serves all three:
+
+* R, G: X and Y of the tangent-space normal; Z is rebuilt in the shader.
+* B: diffuse brightness of the lights texture.
+* A: emission brightness.
+
+The lights textures are grayscale, so brightness is all the hull
+materials need from them. :func:`ensure_atlas` rebuilds
+``textures/hull_atlas.png`` whenever a source texture is newer; it only
+needs NumPy, so it can run without Blender::
+
+    python -c "import sys; from spaceship_generator.cli import main; sys.exit(main(sys.argv[1:]))" pack-textures
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - NumPy ships with Blender
+    np = None  # type: ignore
+
+from .utils import decode_png, encode_png, resource_path
+
+NORMAL_TEXTURE = "hull_normal.png"
+DIFFUSE_TEXTURE = "hull_lights_diffuse.png"
+EMIT_TEXTURE = "hull_lights_emit.png"
+ATLAS_TEXTURE = "hull_atlas.png"
+
+
+def _brightness(image):
+    image = image.astype(np.float32)
+    if image.shape[2] < 3:
+        return image[..., 0]
+    return image[..., :3] @ np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+def pack_atlas(normal, diffuse, emit):
+    """Return the ``(height, width, 4)`` ``uint8`` atlas of three decoded textures."""
+
+    shapes = {image.shape[:2] for image in (normal, diffuse, emit)}
+    if len(shapes) != 1:
+        raise ValueError("hull textures must all have the same size, got %s" % sorted(shapes))
+    if normal.shape[2] < 3:
+        raise ValueError("%s must be an RGB image" % NORMAL_TEXTURE)
+    atlas = np.empty(normal.shape[:2] + (4,), dtype=np.uint8)
+    atlas[..., :2] = normal[..., :2]
+    atlas[..., 2] = np.rint(_brightness(diffuse))
+    atlas[..., 3] = np.rint(_brightness(emit))
+    return atlas
+
+
+def atlas_is_stale(texture_dir: Optional[str] = None) -> bool:
+    """Return whether the atlas is missing or older than a source texture."""
+
+    texture_dir = texture_dir or resource_path("textures")
+    atlas_path = os.path.join(texture_dir, ATLAS_TEXTURE)
+    if not os.path.exists(atlas_path):
+        return True
+    atlas_time = os.path.getmtime(atlas_path)
+    return any(
+        os.path.getmtime(os.path.join(texture_dir, name)) > atlas_time
+        for name in (NORMAL_TEXTURE, DIFFUSE_TEXTURE, EMIT_TEXTURE)
+        if os.path.exists(os.path.join(texture_dir, name))
+    )
+
+
+def ensure_atlas(texture_dir: Optional[str] = None, force: bool = False) -> str:
+    """Build the atlas if it is stale, or always with ``force``, and return its path."""
+
+    texture_dir = texture_dir or resource_path("textures")
+    atlas_path = os.path.join(texture_dir, ATLAS_TEXTURE)
+    if not force and not atlas_is_stale(texture_dir):
+        return atlas_path
+
+    images = []
+    for name in (NORMAL_TEXTURE, DIFFUSE_TEXTURE, EMIT_TEXTURE):
+        path = os.path.join(texture_dir, name)
+        if not os.path.exists(path):
+            raise FileNotFoundError("texture atlas source %s not found" % path)
+        with open(path, "rb") as f:
+            images.append(decode_png(f.read()))
+    atlas = pack_atlas(*images)
+    height, width, channels = atlas.shape
+    tmp_path = atlas_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_png(atlas.tobytes(), width, height, channels))
+    os.replace(tmp_path, atlas_path)
+    return atlas_path
@@ -0,0 +1,141 @@
+"""Command line interface for batch jobs.
+
+Generation needs Blender, so run the ``build`` command through it::
+
+    blender -b --python-expr "import sys; from spaceship_generator.cli import main; sys.exit(main())" \
+        -- build fleet/ --start 0 --stop 10000 --shard-size 250
+
+To share a range between machines, run the same command on each with
+``--machine-index i --machine-count n``, copy the output directories
+together and run ``merge``, which does not need Blender. ``thumbnails``
+writes a contact sheet of a seed range, and ``index`` and ``query``
+record and search per-seed descriptors. ``pack-textures`` rebuilds the
+hull texture atlas and, like ``merge`` and ``query``, runs without Blender.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import List, Optional
+
+from . import atlas, fleet, seedindex, thumbnails
+from .utils import script_args
+
+
+def parse_params(items: List[str]) -> dict:
+    """Turn ``key=value`` strings into generator keyword arguments."""
+
+    params = {}
+    for item in items:
+        key, _, value = item.partition("=")
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
+
+
+def parse_range(item: str):
+    """Turn ``name=min:max`` into ``(name, (min, max))``; either bound may be empty."""
+
+    name, _, bounds = item.partition("=")
+    low, sep, high = bounds.partition(":")
+    if not sep:
+        high = low
+    return name, (float(low) if low else None, float(high) if high else None)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    if argv is None:
+        argv = script_args()
+    parser = argparse.ArgumentParser(prog="spaceship_generator")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    build = commands.add_parser("build", help="generate missing shards of a seed range")
+    build.add_argument("out_dir")
+    build.add_argument("--start", type=int, default=0)
+    build.add_argument("--stop", type=int, required=True)
+    build.add_argument("--shard-size", type=int, default=100)
+    build.add_argument("--machine-index", type=int, default=0)
+    build.add_argument("--machine-count", type=int, default=1)
+    build.add_argument(
+        "--param", action="append", default=[], metavar="KEY=VALUE",
+        help="generate_spaceship keyword argument, e.g. num_hull_segments_max=10",
+    )
+
+    merge = commands.add_parser("merge", help="combine shard manifests into one index")
+    merge.add_argument("out_dir")
+
+    sheet = commands.add_parser("thumbnails", help="write a contact sheet of a seed range")
+    sheet.add_argument("path")
+    sheet.add_argument("--start", type=int, default=0)
+    sheet.add_argument("--stop", type=int, required=True)
+    sheet.add_argument("--size", type=int, default=128)
+    sheet.add_argument("--view", choices=sorted(thumbnails.VIEWS), default="side")
+    sheet.add_argument("--columns", type=int)
+    sheet.add_argument("--param", action="append", default=[], metavar="KEY=VALUE")
+
+    index = commands.add_parser("index", help="record searchable descriptors of a seed range")
+    index.add_argument("path")
+    index.add_argument("--start", type=int, default=0)
+    index.add_argument("--stop", type=int, required=True)
+    index.add_argument("--param", action="append", default=[], metavar="KEY=VALUE")
+
+    query = commands.add_parser("query", help="list indexed seeds matching descriptor ranges")
+    query.add_argument("path")
+    query.add_argument(
+        "--where", action="append", default=[], metavar="NAME=MIN:MAX",
+        help="e.g. engines=2: or weapons=0; fields: " + ", ".join(seedindex.FIELDS),
+    )
+
+    pack = commands.add_parser("pack-textures", help="rebuild the hull texture atlas if it is stale")
+    pack.add_argument("--force", action="store_true", help="rebuild even if it is up to date")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        built = fleet.build_shards(
+            args.out_dir,
+            args.start,
+            args.stop,
+            args.shard_size,
+            parse_params(args.param),
+            args.machine_index,
+            args.machine_count,
+        )
+        print("built %d shard(s)" % len(built))
+    elif args.command == "merge":
+        try:
+            index = fleet.merge_shards(args.out_dir)
+        except ValueError as e:
+            print(e)
+            return 1
+        print("indexed seeds %d to %d from %d shard(s)" % (
+            index["seed_start"], index["seed_stop"], len(index["shards"])))
+    elif args.command == "thumbnails":
+        params = parse_params(args.param)
+        images = [
+            thumbnails.thumbnail_seed(str(seed), params, args.size, args.view)
+            for seed in range(args.start, args.stop)
+        ]
+        thumbnails.save_png(args.path, thumbnails.contact_sheet(images, args.columns))
+    elif args.command == "pack-textures":
+        try:
+            print(atlas.ensure_atlas(force=args.force))
+        except (FileNotFoundError, ValueError) as e:
+            print(e)
+            return 1
+    elif args.command == "index":
+        seed_index = seedindex.build_seed_index(range(args.start, args.stop), parse_params(args.param))
+        seed_index.save(args.path)
+        print("indexed %d seed(s)" % len(seed_index))
+    elif args.command == "query":
+        seed_index = seedindex.SeedIndex.load(args.path)
+        for seed in seed_index.query(**dict(parse_range(item) for item in args.where)):
+            print(seed)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - script entry point
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+"""Convex collision proxies computed from generated vertices.
+
+Physics engines want a few convex shapes rather than the render mesh.
+:func:`convex_hull` is a quickhull that keeps the outside points of each
+face in a conflict list, so adding a vertex only retests the points of
+the faces it replaces, fast enough to build proxies in the same pass as
+the ship. :func:`add_collision_proxies` turns hulls into
+wireframe objects parented to the ship.
+"""
+
+from __future__ import annotations
+
+import heapq
+from itertools import count
+from typing import List, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - NumPy ships with Blender
+    np = None  # type: ignore
+
+try:  # pragma: no cover - Blender specific
+    import bpy  # type: ignore
+except Exception:  # pragma: no cover
+    bpy = None  # type: ignore
+
+from .meshdata import MeshData
+
+
+def _planes(points, faces):
+    a, b, c = points[faces[:, 0]], points[faces[:, 1]], points[faces[:, 2]]
+    normals = np.cross(b - a, c - a)
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals, np.einsum("ij,ij->i", normals, a)
+
+
+def convex_hull(points) -> MeshData:
+    """Return the convex hull of ``points`` as a triangle mesh.
+
+    Raises ``ValueError`` if the points are all on one plane.
+    """
+
+    points = np.unique(np.asarray(points, dtype=np.float64).reshape(-1, 3), axis=0)
+    if len(points) < 4:
+        raise ValueError("a convex hull needs at least 4 points, got %d" % len(points))
+    eps = 1e-9 * max(np.abs(points).max(), 1.0)
+
+    # Start from a large tetrahedron.
+    i0 = int(np.argmin(points[:, 0]))
+    i1 = int(np.argmax(np.linalg.norm(points - points[i0], axis=1)))
+    line = points[i1] - points[i0]
+    i2 = int(np.argmax(np.linalg.norm(np.cross(points - points[i0], line), axis=1)))
+    normal = np.cross(line, points[i2] - points[i0])
+    heights = (points - points[i0]) @ normal
+    i3 = int(np.argmax(np.abs(heights)))
+    if abs(heights[i3]) <= eps * max(np.linalg.norm(normal), 1.0):
+        raise ValueError("points are coplanar")
+    if heights[i3] > 0:
+        i1, i2 = i2, i1
+
+    # Each face keeps its plane and the outside points it sees best; only
+    # those can enlarge the hull across it. The farthest of all outside
+    # points is added first, so points that end up on a flat side of the
+    # hull are never made vertices.
+    triangles = {}
+    planes = {}
+    conflicts = {}
+    edge_faces = {}
+    pending = []
+    face_ids = count()
+
+    def add_faces(tris, candidates):
+        tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+        normals, offsets = _planes(points, tris)
+        distances = points[candidates] @ normals.T - offsets
+        best = np.argmax(distances, axis=1)
+        heights = distances[np.arange(len(candidates)), best]
+        outside = heights > eps
+        candidates, best, heights = candidates[outside], best[outside], heights[outside]
+        order = np.argsort(best, kind="stable")
+        bounds = np.searchsorted(best[order], np.arange(len(tris) + 1))
+        for k, tri in enumerate(tris.tolist()):
+            face_id = next(face_ids)
+            triangles[face_id] = tri
+            planes[face_id] = (normals[k], offsets[k])
+            group = order[bounds[k]:bounds[k + 1]]
+            conflicts[face_id] = candidates[group]
+            a, b, c = tri
+            edge_faces[a, b] = edge_faces[b, c] = edge_faces[c, a] = face_id
+            if len(group):
+                farthest = group[np.argmax(heights[group])]
+                heapq.heappush(pending, (-heights[farthest], face_id, int(candidates[farthest])))
+
+    add_faces([[i0, i1, i2], [i0, i3, i1], [i1, i3, i2], [i2, i3, i0]], np.arange(len(points)))
+    while pending:
+        _, face_id, apex = heapq.heappop(pending)
+        if face_id not in triangles:
+            continue
+
+        # Walk from the face to every face the apex can see.
+        visible = {face_id}
+        hidden = set()
+        stack = [face_id]
+        while stack:
+            a, b, c = triangles[stack.pop()]
+            for u, v in ((a, b), (b, c), (c, a)):
+                twin = edge_faces[v, u]
+                if twin in visible or twin in hidden:
+                    continue
+                normal, offset = planes[twin]
+                if points[apex] @ normal - offset > eps:
+                    visible.add(twin)
+                    stack.append(twin)
+                else:
+                    hidden.add(twin)
+
+        # The horizon is made of visible-face edges whose twin is hidden.
+        horizon = []
+        for visible_id in visible:
+            a, b, c = triangles[visible_id]
+            for u, v in ((a, b), (b, c), (c, a)):
+                if edge_faces[v, u] not in visible:
+                    horizon.append((u, v, apex))
+        for visible_id in visible:
+            a, b, c = triangles.pop(visible_id)
+            del edge_faces[a, b], edge_faces[b, c], edge_faces[c, a], planes[visible_id]
+        orphans = np.concatenate([conflicts.pop(visible_id) for visible_id in visible])
+        add_faces(horizon, orphans[orphans != apex])
+
+    faces = np.array(list(triangles.values()), dtype=np.int64)
+    used, face_vertices = np.unique(faces, return_inverse=True)
+    return MeshData(points[used], np.full(len(faces), 3), face_vertices.reshape(-1))
+
+
+def symmetric_copies(points, x: bool = True, y: bool = False) -> List:
+    """Return ``points`` and the copies the Mirror modifier adds."""
+
+    copies = [np.asarray(points, dtype=np.float64).reshape(-1, 3)]
+    for axis, enabled in ((0, x), (1, y)):
+        if enabled:
+            for original in list(copies):
+                flipped = original.copy()
+                flipped[:, axis] *= -1
+                copies.append(flipped)
+    return copies
+
+
+def collision_hulls(vertices, segments: Sequence = (), x: bool = True, y: bool = False) -> List[MeshData]:
+    """Return the convex hull of the whole ship, then one per segment.
+
+    ``vertices`` are the ship's vertex positions before mirroring and
+    ``segments`` a list of point sets, one per hull segment. Each mirrored
+    copy of a segment gets its own piece; degenerate segments are skipped.
+    """
+
+    hulls = [convex_hull(np.concatenate(symmetric_copies(vertices, x, y)))]
+    for segment in segments:
+        for points in symmetric_copies(segment, x, y):
+            try:
+                hulls.append(convex_hull(points))
+            except ValueError:
+                continue
+    return hulls
+
+
+def add_collision_proxies(obj, hulls: Sequence[MeshData]) -> list:  # pragma: no cover - Blender specific
+    """Create wireframe objects for ``hulls`` parented to ``obj``.
+
+    The first is named ``Spaceship Collision``, the rest
+    ``Spaceship Collision Segment``. They are hidden from renders.
+    """
+
+    proxies = []
+    for i, hull in enumerate(hulls):
+        name = "Spaceship Collision" if i == 0 else "Spaceship Collision Segment"
+        proxy = bpy.data.objects.new(name, hull.to_mesh(name=name))
+        proxy.display_type = "WIRE"
+        proxy.hide_render = True
+        proxy.parent = obj
+        for collection in obj.users_collection:
+            collection.objects.link(proxy)
+        proxies.append(proxy)
+    return proxies
@@ -0,0 +1,104 @@
+"""Removal of greebles buried inside the hull.
+
+Cylinders, turrets, spheres and antennas are placed on any face that
+passes the detail stage's tests, including faces that later end up
+inside an asymmetry extrusion, behind a neighboring hull segment or
+inside the half added by the Mirror modifier. Those triangles are never
+seen. :func:`cull_hidden_greebles` tests each greeble against a BVH of
+the hull and deletes the ones that are fully enclosed.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+try:  # pragma: no cover - Blender specific
+    import bmesh  # type: ignore
+    from mathutils import Vector  # type: ignore
+    from mathutils.bvhtree import BVHTree  # type: ignore
+except Exception:  # pragma: no cover
+    bmesh = None  # type: ignore
+    Vector = BVHTree = None  # type: ignore
+
+# Slightly skewed so rays do not run along hull edges.
+RAY_DIRECTIONS = ((0.0, 0.0, 1.0), (0.0, 0.0, -1.0), (0.577, 0.598, 0.556))
+
+
+def mirrored_points(point: Sequence[float], x: bool = True, y: bool = False) -> List[Tuple[float, float, float]]:
+    """Return ``point`` and its images under the Mirror modifier's axes."""
+
+    points = [tuple(point)]
+    for axis, enabled in ((0, x), (1, y)):
+        if enabled:
+            for p in list(points):
+                flipped = list(p)
+                flipped[axis] = -flipped[axis]
+                points.append(tuple(flipped))
+    return points
+
+
+def greeble_is_hidden(
+    points: Iterable[Sequence[float]],
+    is_inside: Callable[[Tuple[float, float, float]], bool],
+    x: bool = True,
+    y: bool = False,
+) -> bool:
+    """Return whether every point is inside the hull or its mirrored copy.
+
+    ``is_inside`` tests a single point against the unmirrored hull; a
+    point is inside the mirrored hull if its mirror image is inside the
+    original.
+    """
+
+    return all(any(is_inside(p) for p in mirrored_points(point, x, y)) for point in points)
+
+
+def point_is_inside(bvh, point) -> bool:  # pragma: no cover - Blender specific
+    """Return whether ``point`` is inside the closed surface in ``bvh``.
+
+    Rays leaving a point inside a closed surface first hit a face from
+    behind. Several rays must agree, which tolerates small holes.
+    """
+
+    origin = Vector(point)
+    for direction in RAY_DIRECTIONS:
+        direction = Vector(direction).normalized()
+        location, normal, index, distance = bvh.ray_cast(origin, direction)
+        if location is None or normal.dot(direction) <= 0:
+            return False
+    return True
+
+
+def cull_hidden_greebles(bm, greebles, x: bool = True, y: bool = False) -> Tuple[int, int]:  # pragma: no cover - Blender specific
+    """Delete greebles of ``bm`` that are hidden inside the hull.
+
+    ``greebles`` holds one list of vertices per greeble; every other
+    face of ``bm`` is treated as hull. ``x`` and ``y`` are the axes
+    mirrored by the Mirror modifier. Returns the number of greebles and
+    triangles removed.
+    """
+
+    greeble_verts = {v for verts in greebles for v in verts}
+    hull_verts = [v for v in bm.verts if v not in greeble_verts]
+    index = {v: i for i, v in enumerate(hull_verts)}
+    polygons = [
+        [index[v] for v in face.verts]
+        for face in bm.faces
+        if not any(v in greeble_verts for v in face.verts)
+    ]
+    if not polygons:
+        return 0, 0
+    bvh = BVHTree.FromPolygons([v.co.copy() for v in hull_verts], polygons)
+
+    def is_inside(point):
+        return point_is_inside(bvh, point)
+
+    hidden = [
+        verts for verts in greebles
+        if verts and greeble_is_hidden((tuple(v.co) for v in verts), is_inside, x, y)
+    ]
+    faces = {f for verts in hidden for v in verts for f in v.link_faces}
+    num_triangles = sum(len(f.verts) - 2 for f in faces)
+    if hidden:
+        bmesh.ops.delete(bm, geom=[v for verts in hidden for v in verts], context="VERTS")
+    return len(hidden), num_triangles
@@ -0,0 +1,134 @@
+"""Stable geometry fingerprints for guarding refactors.
+
+A fingerprint is a SHA-256 hash of a ship's quantized vertex positions,
+polygon topology and material indices. The golden corpus in
+``tests/golden/fingerprints.json`` records the fingerprint of a set of
+seeds and parameters; regenerating and comparing them proves a change to
+the generator leaves those ships untouched. Run it inside Blender::
+
+    blender -b --python-expr "import sys; from spaceship_generator.fingerprint import main; sys.exit(main())" \\
+        -- tests/golden/fingerprints.json [--update]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from typing import Callable, List, Optional
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - NumPy ships with Blender
+    np = None  # type: ignore
+
+from .meshdata import MeshData
+from .utils import remove_spaceship, script_args
+
+DEFAULT_PRECISION = 1e-4
+
+
+def fingerprint(data: MeshData, precision: float = DEFAULT_PRECISION) -> str:
+    """Return a hex digest identifying the geometry in ``data``.
+
+    Vertex positions are rounded to multiples of ``precision`` so that
+    harmless float noise does not change the result. Some BMesh operators
+    order their new elements differently from run to run, so vertices and
+    polygons are hashed in a canonical order; winding still counts.
+    """
+
+    quantized = np.round(data.vertices.astype(np.float64) / precision).astype("<i8")
+    positions, ranks = np.unique(quantized, axis=0, return_inverse=True)
+    ranks = ranks.reshape(-1)[data.face_vertices].tolist()
+    polygons = []
+    start = 0
+    for size, material_index in zip(data.face_sizes.tolist(), data.material_indices.tolist()):
+        loop = ranks[start:start + size]
+        start += size
+        first = loop.index(min(loop))
+        polygons.append((loop[first:] + loop[:first], material_index))
+    polygons.sort()
+
+    digest = hashlib.sha256()
+    for array in (
+        positions.astype("<i8"),
+        np.array([len(loop) for loop, _ in polygons], dtype="<i4"),
+        np.array([i for loop, _ in polygons for i in loop], dtype="<i4"),
+        np.array([material_index for _, material_index in polygons], dtype="<i4"),
+    ):
+        digest.update(len(array).to_bytes(8, "little"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_seed(
+    random_seed: str, params: Optional[dict] = None, precision: float = DEFAULT_PRECISION
+) -> str:  # pragma: no cover - Blender specific
+    """Generate the ship for ``random_seed`` and return its fingerprint."""
+
+    from .generator import generate_spaceship
+
+    obj = generate_spaceship(random_seed, **(params or {}))
+    try:
+        return fingerprint(MeshData.from_mesh(obj.data), precision)
+    finally:
+        remove_spaceship(obj)
+
+
+def unrecorded_cases(corpus: dict) -> List[dict]:
+    """Return the cases of ``corpus`` that have no fingerprint yet."""
+
+    return [case for case in corpus["cases"] if case.get("fingerprint") is None]
+
+
+def check_corpus(
+    path: str,
+    update: bool = False,
+    fingerprint_case: Callable[[str, Optional[dict], float], str] = fingerprint_seed,
+) -> List[str]:
+    """Regenerate every case in the corpus at ``path`` and compare fingerprints.
+
+    Returns a description of each mismatch and of each case without a
+    recorded fingerprint (see :func:`unrecorded_cases`), which would
+    otherwise pass unchecked. With ``update`` the corpus is rewritten with
+    the new fingerprints instead.
+    """
+
+    with open(path) as f:
+        corpus = json.load(f)
+    precision = corpus.get("precision", DEFAULT_PRECISION)
+    failures = []
+    for case in corpus["cases"]:
+        if not update and case.get("fingerprint") is None:
+            failures.append(
+                "seed %r params %r: no fingerprint recorded, record it with --update"
+                % (case["seed"], case.get("params"))
+            )
+            continue
+        actual = fingerprint_case(case["seed"], case.get("params"), precision)
+        if update:
+            case["fingerprint"] = actual
+        elif actual != case["fingerprint"]:
+            failures.append(
+                "seed %r params %r: expected %s, got %s"
+                % (case["seed"], case.get("params"), case["fingerprint"], actual)
+            )
+    if update:
+        with open(path, "w") as f:
+            json.dump(corpus, f, indent=2)
+            f.write("\n")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:  # pragma: no cover - Blender specific
+    if argv is None:
+        argv = script_args()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus")
+    parser.add_argument("--update", action="store_true", help="record new fingerprints")
+    args = parser.parse_args(argv)
+
+    failures = check_corpus(args.corpus, update=args.update)
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
@@ -0,0 +1,487 @@
+"""Scheduling helpers for generating large fleets of spaceships.
+
+Generation time per seed varies by more than an order of magnitude, so a
+fleet is dispatched longest-job-first: each seed's cost is predicted up
+front and the most expensive seeds are started first. Nothing here needs
+Blender; the actual work for one seed is done by a ``job`` callable,
+typically one that launches a background Blender process.
+
+:func:`assemble_fleet` is the in-scene counterpart: it places many ships
+in the current Blender scene, sharing geometry between identical ones.
+
+:func:`build_shards` splits a long run over a seed range into shards that
+each write their own mesh file and manifest, so interrupted runs resume
+where they stopped and shards can be spread over several machines.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:  # pragma: no cover - Blender specific
+    import bpy  # type: ignore
+except Exception:  # pragma: no cover
+    bpy = None  # type: ignore
+
+from . import __version__
+from .generator import generate_spaceship
+from .meshdata import MeshData, save_meshes
+from .utils import remove_spaceship
+
+
+def estimate_hull_faces(
+    random_seed: str,
+    num_hull_segments_min: int = 3,
+    num_hull_segments_max: int = 6,
+) -> int:
+    """Return the number of faces ``generate_spaceship`` has after its hull stage.
+
+    The hull stage never branches on geometry, so its random draws can be
+    replayed without Blender. The draw order below must stay in sync with
+    :func:`spaceship_generator.generator.generate_spaceship`.
+    """
+
+    rng = Random(random_seed)
+    for _ in range(3):
+        rng.uniform(0.75, 2.0)
+
+    num_extrusions = 0
+    # The starting cube has exactly two faces with ``abs(normal.x) > 0.5``.
+    for _ in range(2):
+        rng.uniform(0.3, 1)
+        num_hull_segments = rng.randint(num_hull_segments_min, num_hull_segments_max)
+        for i in range(num_hull_segments):
+            is_last_hull_segment = i == num_hull_segments - 1
+            if rng.random() > 0.1:
+                num_extrusions += 1
+                if rng.random() > 0.75:
+                    num_extrusions += 1
+                if rng.random() > 0.5:
+                    rng.uniform(1.2, 1.5)
+                    rng.uniform(1.2, 1.5)
+                    if not is_last_hull_segment:
+                        rng.random()
+                if rng.random() > 0.5:
+                    rng.uniform(0.1, 0.4)
+                    rng.random()
+                if rng.random() > 0.5:
+                    rng.random()
+            else:
+                rng.uniform(0.75, 0.95)
+                num_extrusions += 6 * rng.randint(2, 4)
+
+    # Every discrete extrusion of a quad adds four side faces.
+    return 6 + 4 * num_extrusions
+
+
+def params_key(params: Optional[dict]) -> str:
+    """Return a stable string identifying a set of generation parameters."""
+
+    return json.dumps(params or {}, sort_keys=True)
+
+
+class CostModel:
+    """Predict generation time for a seed.
+
+    Seeds that have been timed before are predicted from their recorded
+    time. Everything else is predicted from :func:`estimate_hull_faces`
+    through a linear fit that is refined with every observed timing.
+    """
+
+    def __init__(self, seconds_per_face: float = 0.002, overhead: float = 0.0):
+        self.seconds_per_face = seconds_per_face
+        self.overhead = overhead
+        self.history: Dict[str, Dict[str, float]] = {}
+        # Running sums of (units, seconds) over the history for the fit.
+        self._units: Dict[Tuple[str, str], int] = {}
+        self._sums = [0.0] * 5  # n, sum x, sum y, sum xy, sum xx
+
+    def estimate_units(self, random_seed: str, params: Optional[dict] = None) -> int:
+        params = params or {}
+        return estimate_hull_faces(
+            random_seed,
+            params.get("num_hull_segments_min", 3),
+            params.get("num_hull_segments_max", 6),
+        )
+
+    def predict(self, random_seed: str, params: Optional[dict] = None) -> float:
+        timings = self.history.get(params_key(params))
+        if timings and random_seed in timings:
+            return timings[random_seed]
+        return self.overhead + self.seconds_per_face * self.estimate_units(random_seed, params)
+
+    def observe(self, random_seed: str, params: Optional[dict], seconds: float) -> None:
+        """Record a measured time and refit the linear model."""
+
+        key = params_key(params)
+        timings = self.history.setdefault(key, {})
+        units = self._units.get((key, random_seed))
+        if units is None:
+            units = self._units[(key, random_seed)] = self.estimate_units(random_seed, params)
+        if random_seed in timings:
+            self._accumulate(units, timings[random_seed], -1)
+        timings[random_seed] = seconds
+        self._accumulate(units, seconds, 1)
+        self._refit()
+
+    def _accumulate(self, units: int, seconds: float, sign: int) -> None:
+        for i, value in enumerate((1.0, units, seconds, units * seconds, units * units)):
+            self._sums[i] += sign * value
+
+    def _refit(self) -> None:
+        n, sum_x, sum_y, sum_xy, sum_xx = self._sums
+        var_x = sum_xx - sum_x * sum_x / n if n else 0.0
+        # Needs at least two distinct unit counts; allow for rounding.
+        if var_x <= 1e-9 * max(sum_xx, 1.0):
+            return
+        slope = (sum_xy - sum_x * sum_y / n) / var_x
+        if slope <= 0:
+            return
+        self.seconds_per_face = slope
+        self.overhead = max(0.0, (sum_y - slope * sum_x) / n)
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "seconds_per_face": self.seconds_per_face,
+                    "overhead": self.overhead,
+                    "history": self.history,
+                },
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "CostModel":
+        with open(path) as f:
+            data = json.load(f)
+        model = cls(data["seconds_per_face"], data["overhead"])
+        for key, timings in data.get("history", {}).items():
+            params = json.loads(key)
+            for random_seed, seconds in timings.items():
+                units = model._units[(key, random_seed)] = model.estimate_units(random_seed, params)
+                model.history.setdefault(key, {})[random_seed] = seconds
+                model._accumulate(units, seconds, 1)
+        return model
+
+
+class FleetResult(NamedTuple):
+    random_seed: str
+    predicted: float
+    actual: float
+    value: object
+
+
+class FleetReport(NamedTuple):
+    results: List[FleetResult]
+    wall_time: float
+    num_workers: int
+
+    @property
+    def total_work(self) -> float:
+        return sum(r.actual for r in self.results)
+
+    @property
+    def ideal_wall_time(self) -> float:
+        """Lower bound on wall time: total work spread evenly, or the longest seed."""
+
+        longest = max((r.actual for r in self.results), default=0.0)
+        return max(self.total_work / self.num_workers, longest)
+
+    def summary(self) -> str:
+        lines = ["%-20s %10s %10s" % ("seed", "predicted", "actual")]
+        for r in sorted(self.results, key=lambda r: -r.actual):
+            lines.append("%-20s %9.2fs %9.2fs" % (r.random_seed, r.predicted, r.actual))
+        lines.append(
+            "wall %.2fs, total work %.2fs on %d workers (ideal %.2fs)"
+            % (self.wall_time, self.total_work, self.num_workers, self.ideal_wall_time)
+        )
+        return "\n".join(lines)
+
+
+def run_fleet(
+    seeds: Iterable[str],
+    job: Callable[[str, dict], object],
+    max_workers: int = 4,
+    params: Optional[dict] = None,
+    cost_model: Optional[CostModel] = None,
+) -> FleetReport:
+    """Run ``job(seed, params)`` for every seed, most expensive seeds first.
+
+    Jobs are queued in descending order of predicted cost, so idle workers
+    always pick up the largest remaining seed. Measured times are fed back
+    into ``cost_model`` for the next run.
+    """
+
+    params = dict(params or {})
+    cost_model = cost_model or CostModel()
+    predicted = {s: cost_model.predict(s, params) for s in seeds}
+    order = sorted(predicted, key=lambda s: -predicted[s])
+
+    def timed(random_seed):
+        start = time.perf_counter()
+        value = job(random_seed, params)
+        return value, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(s, executor.submit(timed, s)) for s in order]
+        results = []
+        for random_seed, future in futures:
+            value, actual = future.result()
+            cost_model.observe(random_seed, params, actual)
+            results.append(FleetResult(random_seed, predicted[random_seed], actual, value))
+    return FleetReport(results, time.perf_counter() - start, max_workers)
+
+
+class ShipPlacement(NamedTuple):
+    random_seed: str
+    params: Optional[dict] = None
+    location: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    rotation: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+
+
+def linked_duplicate(obj, collection):
+    """Return a linked duplicate of ``obj`` and its children in ``collection``.
+
+    Children such as collision proxies are duplicated too and parented to
+    the new object, keeping their offset from it.
+    """
+
+    duplicate = obj.copy()
+    collection.objects.link(duplicate)
+    for child in obj.children:
+        linked_duplicate(child, collection).parent = duplicate
+    return duplicate
+
+
+def assemble_fleet(placements: Iterable[ShipPlacement]) -> list:  # pragma: no cover - Blender specific
+    """Place a ship for every placement and return the objects.
+
+    Each unique ``(random_seed, params)`` is generated once. Further
+    placements of it are linked duplicates sharing the first object's mesh
+    and materials, so scene memory grows with unique ships only. Their
+    children, e.g. collision proxies, are duplicated with them. Placements
+    without a seed are random and always generated.
+    """
+
+    originals: Dict[Tuple[str, str], object] = {}
+    objects = []
+    for placement in placements:
+        key = (placement.random_seed, params_key(placement.params))
+        original = originals.get(key) if placement.random_seed else None
+        if original is None:
+            obj = generate_spaceship(placement.random_seed, **(placement.params or {}))
+            if placement.random_seed:
+                originals[key] = obj
+        else:
+            obj = linked_duplicate(original, bpy.context.collection)
+        obj.location = placement.location
+        obj.rotation_euler = placement.rotation
+        objects.append(obj)
+    return objects
+
+
+class Shard(NamedTuple):
+    index: int
+    seed_start: int
+    seed_stop: int
+
+    @property
+    def name(self) -> str:
+        return "shard_%05d" % self.index
+
+
+def plan_shards(seed_start: int, seed_stop: int, shard_size: int) -> List[Shard]:
+    """Split the seeds ``seed_start <= seed < seed_stop`` into shards."""
+
+    return [
+        Shard(i, start, min(start + shard_size, seed_stop))
+        for i, start in enumerate(range(seed_start, seed_stop, shard_size))
+    ]
+
+
+def params_hash(params: Optional[dict]) -> str:
+    return hashlib.sha256(params_key(params).encode()).hexdigest()[:16]
+
+
+def file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_json(path: str, data) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str):
+    with open(path) as f:
+        return json.load(f)
+
+
+def shard_is_complete(out_dir: str, shard: Shard, params: Optional[dict] = None) -> bool:
+    """Return whether ``shard`` was built with ``params`` and its files are intact."""
+
+    manifest_path = os.path.join(out_dir, shard.name + ".json")
+    if not os.path.exists(manifest_path):
+        return False
+    manifest = _read_json(manifest_path)
+    if (
+        manifest.get("seed_start") != shard.seed_start
+        or manifest.get("seed_stop") != shard.seed_stop
+        or manifest.get("params_hash") != params_hash(params)
+        or manifest.get("version") != __version__
+    ):
+        return False
+    return not _damaged_files(out_dir, manifest)
+
+
+def _damaged_files(out_dir: str, manifest: dict) -> List[str]:
+    """Return the files of ``manifest`` that are missing or fail their checksum."""
+
+    damaged = []
+    for filename, checksum in manifest.get("files", {}).items():
+        path = os.path.join(out_dir, filename)
+        if not os.path.exists(path) or file_checksum(path) != checksum:
+            damaged.append(filename)
+    return damaged
+
+
+def generate_mesh_data(random_seed: str, params: dict) -> MeshData:  # pragma: no cover - Blender specific
+    """Generate a ship, copy out its mesh and delete it from the scene."""
+
+    obj = generate_spaceship(random_seed, **params)
+    try:
+        return MeshData.from_mesh(obj.data)
+    finally:
+        remove_spaceship(obj)
+
+
+def build_shard(
+    out_dir: str,
+    shard: Shard,
+    params: Optional[dict] = None,
+    generate: Callable[[str, dict], MeshData] = generate_mesh_data,
+) -> dict:
+    """Generate every seed of ``shard`` into one mesh file and write its manifest.
+
+    The manifest is written last, so a shard only counts as complete once
+    all of its output is on disk.
+    """
+
+    params = dict(params or {})
+    seeds = [str(s) for s in range(shard.seed_start, shard.seed_stop)]
+    filename = shard.name + ".npz"
+    path = os.path.join(out_dir, filename)
+    save_meshes(path + ".tmp", seeds, (generate(s, params) for s in seeds))
+    os.replace(path + ".tmp", path)
+    manifest = {
+        "shard": shard.index,
+        "seed_start": shard.seed_start,
+        "seed_stop": shard.seed_stop,
+        "params": params,
+        "params_hash": params_hash(params),
+        "version": __version__,
+        "files": {filename: file_checksum(path)},
+        "completed": time.time(),
+    }
+    _write_json(os.path.join(out_dir, shard.name + ".json"), manifest)
+    return manifest
+
+
+def build_shards(
+    out_dir: str,
+    seed_start: int,
+    seed_stop: int,
+    shard_size: int = 100,
+    params: Optional[dict] = None,
+    machine_index: int = 0,
+    machine_count: int = 1,
+    generate: Callable[[str, dict], MeshData] = generate_mesh_data,
+) -> List[Shard]:
+    """Build all missing shards of a seed range and return the ones built.
+
+    Shards with an intact manifest for the same parameters and package
+    version are skipped. With ``machine_count`` greater than one, this
+    process only builds every ``machine_count``-th shard starting at
+    ``machine_index``, so several machines can share one range.
+    """
+
+    os.makedirs(out_dir, exist_ok=True)
+    built = []
+    for shard in plan_shards(seed_start, seed_stop, shard_size):
+        if shard.index % machine_count != machine_index:
+            continue
+        if shard_is_complete(out_dir, shard, params):
+            continue
+        build_shard(out_dir, shard, params, generate)
+        built.append(shard)
+    return built
+
+
+def merge_shards(out_dir: str, index_name: str = "index.json") -> dict:
+    """Combine the shard manifests in ``out_dir`` into one index file.
+
+    Raises ``ValueError`` if the shards were built with different
+    parameters or package versions, if their seed ranges leave gaps or if
+    a shard's files are missing or do not match their checksums.
+    """
+
+    manifests = sorted(
+        (
+            _read_json(os.path.join(out_dir, name))
+            for name in os.listdir(out_dir)
+            if name.startswith("shard_") and name.endswith(".json")
+        ),
+        key=lambda m: m["seed_start"],
+    )
+    if not manifests:
+        raise ValueError("no shard manifests in %s" % out_dir)
+    for key in ("params_hash", "version"):
+        values = {m[key] for m in manifests}
+        if len(values) > 1:
+            raise ValueError("shards disagree on %s: %s" % (key, ", ".join(sorted(values))))
+    for previous, manifest in zip(manifests, manifests[1:]):
+        if previous["seed_stop"] != manifest["seed_start"]:
+            raise ValueError(
+                "seeds %d to %d are missing" % (previous["seed_stop"], manifest["seed_start"])
+            )
+    for manifest in manifests:
+        damaged = _damaged_files(out_dir, manifest)
+        if damaged:
+            raise ValueError(
+                "shard of seeds %d to %d has missing or corrupt files: %s"
+                % (manifest["seed_start"], manifest["seed_stop"], ", ".join(sorted(damaged)))
+            )
+
+    index = {
+        "seed_start": manifests[0]["seed_start"],
+        "seed_stop": manifests[-1]["seed_stop"],
+        "params": manifests[0]["params"],
+        "params_hash": manifests[0]["params_hash"],
+        "version": manifests[0]["version"],
+        "shards": [
+            {
+                "seed_start": m["seed_start"],
+                "seed_stop": m["seed_stop"],
+                "files": m["files"],
+            }
+            for m in manifests
+        ],
+    }
+    _write_json(os.path.join(out_dir, index_name), index)
+    return index
@@ -0,0 +1,209 @@
+"""Background encoding and writing of rendered movie frames.
+
+``generate_movie`` hands each rendered frame to a :class:`FrameWriter`
+and carries on with the next frame while PNG compression and disk writes
+happen on worker threads. ``zlib`` and NumPy release the GIL, so this
+overlaps with rendering.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - NumPy ships with Blender
+    np = None  # type: ignore
+
+from .utils import encode_png
+
+
+def float_to_srgb8(pixels, width: int, height: int, channels: int = 4) -> bytes:
+    """Convert Blender's linear float pixels to 8-bit sRGB bytes.
+
+    ``pixels`` is laid out like ``bpy.types.Image.pixels``: rows from bottom
+    to top. The result has rows from top to bottom, as image files expect.
+    Alpha is kept linear.
+    """
+
+    rgba = np.asarray(pixels, dtype=np.float32).reshape(height, width, channels)[::-1]
+    rgba = np.clip(rgba, 0.0, 1.0)
+    color = rgba[..., :3]
+    srgb = np.where(color <= 0.0031308, color * 12.92, 1.055 * np.power(color, 1 / 2.4) - 0.055)
+    out = np.empty((height, width, channels), dtype=np.uint8)
+    out[..., :3] = np.rint(srgb * 255.0)
+    if channels > 3:
+        out[..., 3:] = np.rint(rgba[..., 3:] * 255.0)
+    return out.tobytes()
+
+
+@contextmanager
+def standard_view_transform(scene):
+    """Render ``scene`` with the plain sRGB transform of :func:`float_to_srgb8`.
+
+    Files saved by ``write_still`` go through the scene's view transform,
+    look, exposure, gamma, curves and dithering, while Viewer node pixels
+    are read back linear. With all of those neutral both give the same
+    bytes. The previous settings are restored on exit.
+    """
+
+    view = scene.view_settings
+    neutral = {
+        "view_transform": "Standard",
+        "look": "None",
+        "exposure": 0.0,
+        "gamma": 1.0,
+        "use_curve_mapping": False,
+    }
+    saved_view = {name: getattr(view, name) for name in neutral}
+    saved_display = scene.display_settings.display_device
+    saved_dither = scene.render.dither_intensity
+    try:
+        scene.display_settings.display_device = "sRGB"
+        for name, value in neutral.items():
+            setattr(view, name, value)
+        scene.render.dither_intensity = 0.0
+        yield
+    finally:
+        scene.render.dither_intensity = saved_dither
+        scene.display_settings.display_device = saved_display
+        for name, value in saved_view.items():
+            setattr(view, name, value)
+
+
+@contextmanager
+def viewer_node(scene):
+    """Route the render result into the compositor's Viewer node.
+
+    ``bpy.data.images["Render Result"]`` exposes no pixels from Python, but
+    the ``Viewer Node`` image does once compositing has run. On exit the
+    nodes and link added here are removed and ``scene.use_nodes`` is reset.
+    """
+
+    use_nodes = scene.use_nodes
+    scene.use_nodes = True
+    tree = scene.node_tree
+    added = []
+    viewer = None
+    previous = []
+    try:
+        layers = next((n for n in tree.nodes if n.type == "R_LAYERS"), None)
+        if layers is None:
+            layers = tree.nodes.new("CompositorNodeRLayers")
+            added.append(layers)
+        viewer = next((n for n in tree.nodes if n.type == "VIEWER"), None)
+        if viewer is None:
+            viewer = tree.nodes.new("CompositorNodeViewer")
+            added.append(viewer)
+        previous = [link.from_socket for link in viewer.inputs["Image"].links]
+        tree.links.new(layers.outputs["Image"], viewer.inputs["Image"])
+        yield viewer
+    finally:
+        if viewer is not None and viewer not in added:
+            if previous:
+                tree.links.new(previous[0], viewer.inputs["Image"])
+            else:
+                for link in list(viewer.inputs["Image"].links):
+                    tree.links.remove(link)
+        for node in reversed(added):
+            tree.nodes.remove(node)
+        scene.use_nodes = use_nodes
+
+
+def read_viewer_pixels(image):  # pragma: no cover - Blender specific
+    """Return ``(pixels, width, height)`` of the ``Viewer Node`` image."""
+
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels, width, height
+
+
+def ffmpeg_command(path: str, width: int, height: int, fps: int = 24) -> List[str]:
+    """Return an ``ffmpeg`` command encoding raw RGBA frames from stdin to ``path``."""
+
+    return [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgba",
+        "-s", "%dx%d" % (width, height), "-r", str(fps),
+        "-i", "-",
+        "-pix_fmt", "yuv420p", path,
+    ]
+
+
+class FrameWriter:
+    """Encode and write frames on background threads.
+
+    At most ``max_pending`` frames are queued; :meth:`submit` blocks once
+    that many are waiting, which bounds memory when rendering outpaces
+    disk. With ``pipe_command`` the frames are streamed in order as raw
+    RGBA to the stdin of that process instead of being written as PNGs.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        pipe_command: Optional[Sequence[str]] = None,
+        compress_level: int = 6,
+    ):
+        self.compress_level = compress_level
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures = []
+        self._process = None
+        if pipe_command:
+            self._process = subprocess.Popen(list(pipe_command), stdin=subprocess.PIPE)
+            # A single thread keeps piped frames in order.
+            max_workers = 1
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, path: str, pixels, width: int, height: int, channels: int = 4) -> None:
+        """Queue a frame given as float pixels in ``bpy.types.Image`` layout."""
+
+        self._raise_failures()
+        self._slots.acquire()
+        future = self._executor.submit(self._write, path, pixels, width, height, channels)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def _write(self, path, pixels, width, height, channels):
+        data = float_to_srgb8(pixels, width, height, channels)
+        if self._process is not None:
+            self._process.stdin.write(data)
+            return
+        png = encode_png(data, width, height, channels, self.compress_level)
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(png)
+
+    def _raise_failures(self) -> None:
+        futures, self._futures = self._futures, []
+        for future in futures:
+            if future.done():
+                future.result()
+            else:
+                self._futures.append(future)
+
+    def close(self) -> None:
+        """Wait for all queued frames and re-raise the first failure."""
+
+        self._executor.shutdown(wait=True)
+        try:
+            self._raise_failures()
+        finally:
+            if self._process is not None:
+                self._process.stdin.close()
+                self._process.wait()
+
+    def __enter__(self) -> "FrameWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
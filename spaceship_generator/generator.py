@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import datetime
 import os
+from contextlib import ExitStack
 from math import cos, sin, radians
 from random import randint, random, seed, uniform
 
@@ -15,25 +16,45 @@ except Exception:  # pragma: no cover
     bpy = bmesh = None  # type: ignore
     Matrix = Vector = None  # type: ignore
 
+from . import culling
+from .collision import add_collision_proxies, collision_hulls
+from .frames import FrameWriter, read_viewer_pixels, standard_view_transform, viewer_node
 from .geometry import (
     add_cylinders_to_face,
     add_disc_to_face,
     add_exhaust_to_face,
     add_grid_to_face,
+    add_grid_to_faces,
     add_sphere_to_face,
     add_surface_antenna_to_face,
     add_weapons_to_face,
     extrude_face,
+    extrude_faces,
+    cached_face_metrics,
     get_aspect_ratio,
+    invalidate_face_metrics,
     is_rear_face,
     ribbed_extrude_face,
     scale_face,
 )
-from .materials import Material, create_materials
-from .utils import reset_scene
+from .materials import Material, create_materials, random_hull_color, update_hull_color
+from .meshdata import MeshData, write_normals, write_uvs
+from .utils import remove_spaceship, reset_scene
 
 
-def generate_spaceship(
+def _clear_materials(mesh) -> None:
+    """Empty the material slots of ``mesh`` and delete materials left unused."""
+
+    materials = [material for material in mesh.materials if material is not None]
+    mesh.materials.clear()
+    mesh.pop("spaceship_materials", None)
+    for material in materials:
+        if not material.users:
+            bpy.data.materials.remove(material)
+
+
+@cached_face_metrics
+def iter_generate_spaceship(
     random_seed: str = "",
     num_hull_segments_min: int = 3,
     num_hull_segments_max: int = 6,
@@ -45,167 +66,428 @@ def generate_spaceship(
     allow_vertical_symmetry: bool = False,
     apply_bevel_modifier: bool = True,
     assign_materials: bool = True,
+    batch_extrusions: bool = False,
+    memory_profiler=None,
+    bake_uvs: bool = True,
+    hard_edge_angle: float = 180.0,
+    descriptors=None,
+    collision_proxies: bool = False,
+    collision_segments: bool = False,
+    cull_hidden_greebles: bool = False,
+    texture_atlas: bool = False,
+    reuse_object=None,
 ):
-    """Generate a procedural spaceship mesh and return the object."""
+    """Generate a spaceship one step at a time.
+
+    This generator yields the name of the current stage after every small
+    unit of work and returns the new object when it is exhausted, so
+    callers can spread generation over several event loop ticks. Closing
+    it early frees the partial mesh. It relies on the global ``random``
+    state, which callers interleaving other work must save and restore.
+
+    ``batch_extrusions`` extrudes all faces of the asymmetry stage, and the
+    cells of each grid, together instead of one operator call per face. The
+    grids come out as without batching, but the asymmetry stage creates
+    faces in a different order, so a given seed yields a different ship
+    than with batching disabled.
+
+    ``memory_profiler`` is an optional
+    :class:`~spaceship_generator.profiling.MemoryProfiler` that records
+    memory use and element counts at the end of each stage.
+
+    ``bake_uvs`` stores cube-projected UVs on the mesh so materials can use
+    plain UV lookups and exported ships carry texture coordinates.
+
+    The ship is shaded smooth. With ``hard_edge_angle`` below 180 degrees,
+    custom normals keep edges sharper than that angle hard.
+
+    ``descriptors``, if given, is a dict filled with the hull's bounding box
+    extents, the number of faces picked for each kind of detail and the
+    final face and vertex counts. Once all are set, and before any Blender
+    datablock is created, the generator yields ``"descriptors"``; callers
+    that only need them close it there.
+
+    ``collision_proxies`` adds a wireframe convex hull of the ship as a
+    child object for physics engines; ``collision_segments`` adds one more
+    per hull segment and implies ``collision_proxies``.
+
+    ``cull_hidden_greebles`` deletes cylinders, turrets, spheres and
+    antennas that end up entirely inside the hull or its mirrored half.
+    The number removed and the triangles saved are stored in the object's
+    ``culled_greebles`` and ``culled_triangles`` custom properties.
+
+    ``texture_atlas`` makes the hull materials sample the packed texture
+    atlas once instead of three separate textures.
+
+    ``reuse_object`` is a ship generated earlier whose mesh, modifiers and
+    materials are updated in place instead of creating new datablocks;
+    only the hull color of its materials changes, unless ``bake_uvs`` or
+    ``texture_atlas`` differ from when they were made, in which case they
+    are replaced. Returns that object.
+    """
 
     if random_seed:
         seed(random_seed)
 
+    hull_segments = []
+    greebles = [] if cull_hidden_greebles else None
+    culled = (0, 0)
     bm = bmesh.new()
-    bmesh.ops.create_cube(bm, size=1)
-    scale_vector = Vector((uniform(0.75, 2.0), uniform(0.75, 2.0), uniform(0.75, 2.0)))
-    bmesh.ops.scale(bm, vec=scale_vector, verts=bm.verts)
-
-    for face in bm.faces[:]:
-        if abs(face.normal.x) > 0.5:
-            hull_segment_length = uniform(0.3, 1)
-            num_hull_segments = randint(num_hull_segments_min, num_hull_segments_max)
-            hull_segment_range = range(num_hull_segments)
-            for i in hull_segment_range:
-                is_last_hull_segment = i == hull_segment_range[-1]
-                val = random()
-                if val > 0.1:
-                    face = extrude_face(bm, face, hull_segment_length)
-                    if random() > 0.75:
-                        face = extrude_face(bm, face, hull_segment_length * 0.25)
-
-                    if random() > 0.5:
-                        sy = uniform(1.2, 1.5)
-                        sz = uniform(1.2, 1.5)
-                        if is_last_hull_segment or random() > 0.5:
-                            sy = 1 / sy
-                            sz = 1 / sz
-                        scale_face(bm, face, 1, sy, sz)
-
-                    if random() > 0.5:
-                        sideways_translation = Vector(
-                            (0, 0, uniform(0.1, 0.4) * scale_vector.z * hull_segment_length)
-                        )
+    try:
+        bmesh.ops.create_cube(bm, size=1)
+        scale_vector = Vector((uniform(0.75, 2.0), uniform(0.75, 2.0), uniform(0.75, 2.0)))
+        bmesh.ops.scale(bm, vec=scale_vector, verts=bm.verts)
+
+        for face in bm.faces[:]:
+            if abs(face.normal.x) > 0.5:
+                hull_segment_length = uniform(0.3, 1)
+                num_hull_segments = randint(num_hull_segments_min, num_hull_segments_max)
+                hull_segment_range = range(num_hull_segments)
+                for i in hull_segment_range:
+                    is_last_hull_segment = i == hull_segment_range[-1]
+                    segment_start = [tuple(v.co) for v in face.verts]
+                    val = random()
+                    if val > 0.1:
+                        face = extrude_face(bm, face, hull_segment_length)
+                        if random() > 0.75:
+                            face = extrude_face(bm, face, hull_segment_length * 0.25)
+
+                        if random() > 0.5:
+                            sy = uniform(1.2, 1.5)
+                            sz = uniform(1.2, 1.5)
+                            if is_last_hull_segment or random() > 0.5:
+                                sy = 1 / sy
+                                sz = 1 / sz
+                            scale_face(bm, face, 1, sy, sz)
+
                         if random() > 0.5:
-                            sideways_translation = -sideways_translation
-                        bmesh.ops.translate(bm, vec=sideways_translation, verts=face.verts)
+                            sideways_translation = Vector(
+                                (0, 0, uniform(0.1, 0.4) * scale_vector.z * hull_segment_length)
+                            )
+                            if random() > 0.5:
+                                sideways_translation = -sideways_translation
+                            bmesh.ops.translate(bm, vec=sideways_translation, verts=face.verts)
+                            invalidate_face_metrics([face])
 
-                    if random() > 0.5:
-                        angle = 5
                         if random() > 0.5:
-                            angle = -angle
-                        bmesh.ops.rotate(
-                            bm,
-                            verts=face.verts,
-                            cent=(0, 0, 0),
-                            matrix=Matrix.Rotation(radians(angle), 3, "Y"),
+                            angle = 5
+                            if random() > 0.5:
+                                angle = -angle
+                            bmesh.ops.rotate(
+                                bm,
+                                verts=face.verts,
+                                cent=(0, 0, 0),
+                                matrix=Matrix.Rotation(radians(angle), 3, "Y"),
+                            )
+                            invalidate_face_metrics([face])
+                    else:
+                        rib_scale = uniform(0.75, 0.95)
+                        face = ribbed_extrude_face(
+                            bm, face, hull_segment_length, randint(2, 4), rib_scale
                         )
-                else:
-                    rib_scale = uniform(0.75, 0.95)
-                    face = ribbed_extrude_face(
-                        bm, face, hull_segment_length, randint(2, 4), rib_scale
-                    )
+                    if collision_segments:
+                        hull_segments.append(segment_start + [tuple(v.co) for v in face.verts])
+                    yield "hull"
+
+        if memory_profiler is not None:
+            memory_profiler.record("hull", bm, seed=random_seed)
+        if descriptors is not None:
+            for axis in "xyz":
+                coords = [getattr(v.co, axis) for v in bm.verts]
+                descriptors["extent_" + axis] = max(coords) - min(coords)
+
+        # Face metrics are cached per stage; start each stage from a clean slate.
+        invalidate_face_metrics()
+        if create_asymmetry_segments:
+            asymmetry_chains = []
+            for face in bm.faces[:]:
+                if get_aspect_ratio(face) > 4:
+                    continue
+                if random() > 0.85:
+                    hull_piece_length = uniform(0.1, 0.4)
+                    if batch_extrusions:
+                        scales = [
+                            1 / uniform(1.1, 1.5) if random() > 0.25 else 1.0
+                            for _ in range(randint(num_asymmetry_segments_min, num_asymmetry_segments_max))
+                        ]
+                        if scales:
+                            asymmetry_chains.append((face, hull_piece_length, scales))
+                        continue
+                    for _ in range(randint(num_asymmetry_segments_min, num_asymmetry_segments_max)):
+                        face = extrude_face(bm, face, hull_piece_length)
+                        if random() > 0.25:
+                            s = 1 / uniform(1.1, 1.5)
+                            scale_face(bm, face, s, s, s)
+                    yield "asymmetry"
+
+            # Extrude the n-th segment of every chain together.
+            while asymmetry_chains:
+                new_faces = extrude_faces(
+                    bm,
+                    [face for face, _, _ in asymmetry_chains],
+                    [length for _, length, _ in asymmetry_chains],
+                    [scales[0] for _, _, scales in asymmetry_chains],
+                )
+                asymmetry_chains = [
+                    (new_face, length, scales[1:])
+                    for new_face, (_, length, scales) in zip(new_faces, asymmetry_chains)
+                    if len(scales) > 1
+                ]
+                yield "asymmetry"
+
+        if memory_profiler is not None:
+            memory_profiler.record("asymmetry", bm, seed=random_seed)
+
+        invalidate_face_metrics()
+        if create_face_detail:
+            engine_faces = []
+            grid_faces = []
+            antenna_faces = []
+            weapon_faces = []
+            sphere_faces = []
+            disc_faces = []
+            cylinder_faces = []
+            for face in bm.faces[:]:
+                if get_aspect_ratio(face) > 3:
+                    continue
 
-    if create_asymmetry_segments:
-        for face in bm.faces[:]:
-            if get_aspect_ratio(face) > 4:
-                continue
-            if random() > 0.85:
-                hull_piece_length = uniform(0.1, 0.4)
-                for _ in range(randint(num_asymmetry_segments_min, num_asymmetry_segments_max)):
-                    face = extrude_face(bm, face, hull_piece_length)
-                    if random() > 0.25:
-                        s = 1 / uniform(1.1, 1.5)
-                        scale_face(bm, face, s, s, s)
-
-    if create_face_detail:
-        engine_faces = []
-        grid_faces = []
-        antenna_faces = []
-        weapon_faces = []
-        sphere_faces = []
-        disc_faces = []
-        cylinder_faces = []
-        for face in bm.faces[:]:
-            if get_aspect_ratio(face) > 3:
-                continue
-
-            val = random()
-            if is_rear_face(face):
-                if not engine_faces or val > 0.75:
-                    engine_faces.append(face)
-                elif val > 0.5:
-                    cylinder_faces.append(face)
-                elif val > 0.25:
-                    grid_faces.append(face)
-                else:
-                    face.material_index = Material.hull_lights
-            elif face.normal.x > 0.9:
-                if face.normal.dot(face.calc_center_bounds()) > 0 and val > 0.7:
-                    antenna_faces.append(face)
-                    face.material_index = Material.hull_lights
-                elif val > 0.4:
-                    grid_faces.append(face)
-                else:
-                    face.material_index = Material.hull_lights
-            elif face.normal.z > 0.9:
-                if face.normal.dot(face.calc_center_bounds()) > 0 and val > 0.7:
-                    antenna_faces.append(face)
-                    face.material_index = Material.hull_lights
+                val = random()
+                if is_rear_face(face):
+                    if not engine_faces or val > 0.75:
+                        engine_faces.append(face)
+                    elif val > 0.5:
+                        cylinder_faces.append(face)
+                    elif val > 0.25:
+                        grid_faces.append(face)
+                    else:
+                        face.material_index = Material.hull_lights
+                elif face.normal.x > 0.9:
+                    if face.normal.dot(face.calc_center_bounds()) > 0 and val > 0.7:
+                        antenna_faces.append(face)
+                        face.material_index = Material.hull_lights
+                    elif val > 0.4:
+                        grid_faces.append(face)
+                    else:
+                        face.material_index = Material.hull_lights
+                elif face.normal.z > 0.9:
+                    if face.normal.dot(face.calc_center_bounds()) > 0 and val > 0.7:
+                        antenna_faces.append(face)
+                        face.material_index = Material.hull_lights
+                    elif val > 0.6:
+                        grid_faces.append(face)
+                    elif val > 0.3:
+                        cylinder_faces.append(face)
+                elif face.normal.z < -0.9:
+                    if val > 0.75:
+                        disc_faces.append(face)
+                    elif val > 0.5:
+                        grid_faces.append(face)
+                    elif val > 0.25:
+                        weapon_faces.append(face)
+                elif val > 0.9:
+                    sphere_faces.append(face)
                 elif val > 0.6:
                     grid_faces.append(face)
                 elif val > 0.3:
                     cylinder_faces.append(face)
-            elif face.normal.z < -0.9:
-                if val > 0.75:
-                    disc_faces.append(face)
-                elif val > 0.5:
-                    grid_faces.append(face)
-                elif val > 0.25:
-                    weapon_faces.append(face)
-            elif val > 0.9:
-                sphere_faces.append(face)
-            elif val > 0.6:
-                grid_faces.append(face)
-            elif val > 0.3:
-                cylinder_faces.append(face)
-
-        for face in engine_faces:
-            add_exhaust_to_face(bm, face)
-        for face in grid_faces:
-            add_grid_to_face(bm, face)
-        for face in antenna_faces:
-            add_surface_antenna_to_face(bm, face)
-        for face in weapon_faces:
-            add_weapons_to_face(bm, face)
-        for face in sphere_faces:
-            add_sphere_to_face(bm, face)
-        for face in disc_faces:
-            face.material_index = Material.glow_disc
-            add_disc_to_face(bm, face)
-        for face in cylinder_faces:
-            add_cylinders_to_face(bm, face)
-
-    mesh = bpy.data.meshes.new("Spaceship")
-    bm.to_mesh(mesh)
-    bm.free()
-
-    obj = bpy.data.objects.new("Spaceship", mesh)
-    bpy.context.collection.objects.link(obj)
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
+            if descriptors is not None:
+                descriptors.update(
+                    engines=len(engine_faces),
+                    grids=len(grid_faces),
+                    antennas=len(antenna_faces),
+                    weapons=len(weapon_faces),
+                    spheres=len(sphere_faces),
+                    discs=len(disc_faces),
+                    cylinders=len(cylinder_faces),
+                )
+            yield "detail"
+
+            for face in engine_faces:
+                add_exhaust_to_face(bm, face)
+                yield "detail"
+            if batch_extrusions:
+                add_grid_to_faces(bm, grid_faces)
+                yield "detail"
+            else:
+                for face in grid_faces:
+                    add_grid_to_face(bm, face)
+                    yield "detail"
+            for face in antenna_faces:
+                add_surface_antenna_to_face(bm, face, greeble_verts=greebles)
+                yield "detail"
+            for face in weapon_faces:
+                add_weapons_to_face(bm, face, greeble_verts=greebles)
+                yield "detail"
+            for face in sphere_faces:
+                add_sphere_to_face(bm, face, greeble_verts=greebles)
+                yield "detail"
+            for face in disc_faces:
+                # An earlier greeble may have dissolved this face.
+                if not face.is_valid:
+                    continue
+                face.material_index = Material.glow_disc
+                add_disc_to_face(bm, face)
+                yield "detail"
+            for face in cylinder_faces:
+                add_cylinders_to_face(bm, face, greeble_verts=greebles)
+                yield "detail"
+
+        if greebles:
+            culled = culling.cull_hidden_greebles(
+                bm, greebles, allow_horizontal_symmetry, allow_vertical_symmetry
+            )
+            yield "detail"
+
+        if memory_profiler is not None:
+            memory_profiler.record("detail", bm, seed=random_seed)
+        if descriptors is not None:
+            descriptors["num_vertices"] = len(bm.verts)
+            descriptors["num_faces"] = len(bm.faces)
+            yield "descriptors"
+
+        # Reused materials must have been made for the same UV and atlas settings.
+        material_key = "uvs=%d atlas=%d" % (bake_uvs, texture_atlas)
+        keep_materials = False
+        if reuse_object is not None:
+            mesh = reuse_object.data
+            keep_materials = (
+                assign_materials
+                and len(mesh.materials) == len(Material)
+                and mesh.get("spaceship_materials") == material_key
+            )
+            if not keep_materials:
+                # Clearing the slots also resets every material index, so it
+                # has to happen before the new faces are written.
+                _clear_materials(mesh)
+        else:
+            mesh = bpy.data.meshes.new("Spaceship")
+        bm.to_mesh(mesh)
+    finally:
+        # Cached face metrics must not outlive the BMesh.
+        invalidate_face_metrics()
+        bm.free()
+
+    mesh_data = None
+    if bake_uvs or hard_edge_angle < 180.0:
+        mesh_data = MeshData.from_mesh(mesh)
+    if bake_uvs:
+        write_uvs(mesh, mesh_data.cube_project_uvs())
+    elif reuse_object is not None:
+        for uv_layer in list(mesh.uv_layers):
+            mesh.uv_layers.remove(uv_layer)
+    if hard_edge_angle < 180.0:
+        write_normals(mesh, mesh_data.split_normals(hard_edge_angle))
+    else:
+        write_normals(mesh)
+
+    if reuse_object is not None:
+        obj = reuse_object
+        for child in list(obj.children):
+            remove_spaceship(child)
+    else:
+        obj = bpy.data.objects.new("Spaceship", mesh)
+        bpy.context.collection.objects.link(obj)
+        bpy.context.view_layer.objects.active = obj
+        obj.select_set(True)
+    if cull_hidden_greebles:
+        obj["culled_greebles"], obj["culled_triangles"] = culled
 
     if allow_horizontal_symmetry or allow_vertical_symmetry:
-        mod = obj.modifiers.new("Mirror", type="MIRROR")
+        mod = obj.modifiers.get("Mirror")
+        if mod is None:
+            # Keep the mirror ahead of a reused bevel.
+            if "Bevel" in obj.modifiers:
+                obj.modifiers.remove(obj.modifiers["Bevel"])
+            mod = obj.modifiers.new("Mirror", type="MIRROR")
         mod.use_axis[0] = allow_horizontal_symmetry
         mod.use_axis[1] = allow_vertical_symmetry
+    elif "Mirror" in obj.modifiers:
+        obj.modifiers.remove(obj.modifiers["Mirror"])
+
+    if collision_proxies or collision_segments:
+        if mesh_data is None:
+            mesh_data = MeshData.from_mesh(mesh)
+        hulls = collision_hulls(
+            mesh_data.vertices, hull_segments, allow_horizontal_symmetry, allow_vertical_symmetry
+        )
+        add_collision_proxies(obj, hulls)
 
     if apply_bevel_modifier:
-        mod = obj.modifiers.new("Bevel", type="BEVEL")
+        mod = obj.modifiers.get("Bevel") or obj.modifiers.new("Bevel", type="BEVEL")
         mod.width = 0.02
         mod.segments = 2
+    elif "Bevel" in obj.modifiers:
+        obj.modifiers.remove(obj.modifiers["Bevel"])
+
+    if keep_materials:
+        update_hull_color(mesh.materials, random_hull_color())
+    elif assign_materials:
+        for mat in create_materials(use_uvs=bake_uvs, use_atlas=texture_atlas):
+            mesh.materials.append(mat)
+        mesh["spaceship_materials"] = material_key
+
+    if memory_profiler is not None:
+        memory_profiler.record("object", seed=random_seed)
+    return obj
 
-    if assign_materials:
-        for mat in create_materials():
-            obj.data.materials.append(mat)
 
-    bpy.ops.object.shade_smooth()
-    return obj
+def generate_spaceship(
+    random_seed: str = "",
+    num_hull_segments_min: int = 3,
+    num_hull_segments_max: int = 6,
+    create_asymmetry_segments: bool = True,
+    num_asymmetry_segments_min: int = 1,
+    num_asymmetry_segments_max: int = 5,
+    create_face_detail: bool = True,
+    allow_horizontal_symmetry: bool = True,
+    allow_vertical_symmetry: bool = False,
+    apply_bevel_modifier: bool = True,
+    assign_materials: bool = True,
+    batch_extrusions: bool = False,
+    memory_profiler=None,
+    bake_uvs: bool = True,
+    hard_edge_angle: float = 180.0,
+    descriptors=None,
+    collision_proxies: bool = False,
+    collision_segments: bool = False,
+    cull_hidden_greebles: bool = False,
+    texture_atlas: bool = False,
+    reuse_object=None,
+):
+    """Generate a procedural spaceship mesh and return the object.
+
+    Takes the same arguments as :func:`iter_generate_spaceship` and runs
+    all of its steps at once.
+    """
+
+    steps = iter_generate_spaceship(
+        random_seed=random_seed,
+        num_hull_segments_min=num_hull_segments_min,
+        num_hull_segments_max=num_hull_segments_max,
+        create_asymmetry_segments=create_asymmetry_segments,
+        num_asymmetry_segments_min=num_asymmetry_segments_min,
+        num_asymmetry_segments_max=num_asymmetry_segments_max,
+        create_face_detail=create_face_detail,
+        allow_horizontal_symmetry=allow_horizontal_symmetry,
+        allow_vertical_symmetry=allow_vertical_symmetry,
+        apply_bevel_modifier=apply_bevel_modifier,
+        assign_materials=assign_materials,
+        batch_extrusions=batch_extrusions,
+        memory_profiler=memory_profiler,
+        bake_uvs=bake_uvs,
+        hard_edge_angle=hard_edge_angle,
+        descriptors=descriptors,
+        collision_proxies=collision_proxies,
+        collision_segments=collision_segments,
+        cull_hidden_greebles=cull_hidden_greebles,
+        texture_atlas=texture_atlas,
+        reuse_object=reuse_object,
+    )
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
 
 
 def generate_movie(
@@ -224,14 +506,40 @@ def generate_movie(
     yaw_offset: float = 0.0,
     fov: float = 50.0,
     camera_refocus_object_every_frame: bool = True,
+    memory_profiler=None,
+    async_frame_writes: bool = False,
+    frame_pipe_command=None,
+    pool_objects: bool = False,
 ):  # pragma: no cover - Blender specific
-    """Generate a flickering fly-by video by repeatedly generating ships."""
+    """Generate a flickering fly-by video by repeatedly generating ships.
+
+    ``memory_profiler`` is passed on to :func:`generate_spaceship` and also
+    records the state after each scene reset.
+
+    With ``async_frame_writes`` each frame is read back from the compositor
+    and encoded to PNG on background threads while the next frame renders.
+    ``frame_pipe_command`` (see
+    :func:`~spaceship_generator.frames.ffmpeg_command`) streams the frames
+    to an encoder process instead of writing PNGs.
+
+    With ``pool_objects`` the scene is reset only once and every later ship
+    is generated into the same object, mesh and materials (see
+    ``reuse_object`` in :func:`iter_generate_spaceship`), so memory stays
+    flat over long movies.
+
+    Frames are rendered with the Standard view transform and no dithering
+    (see :func:`~spaceship_generator.frames.standard_view_transform`) so
+    every path writes the same pixels; the scene's color management is
+    restored afterwards.
+    """
 
     scene = bpy.context.scene
     render = scene.render
     render.resolution_x = 1920
     render.resolution_y = 1080
     render.image_settings.file_format = "PNG"
+    render.image_settings.color_mode = "RGBA"
+    render.image_settings.color_depth = "8"
 
     if random_seed:
         seed(random_seed)
@@ -246,42 +554,58 @@ def generate_movie(
     scene.camera.data.angle = radians(fov)
     frame = 0
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    while movie_duration < total_movie_duration:
-        movie_duration += inv_fps
-        spaceship_duration += inv_fps
-        if spaceship_duration >= total_spaceship_duration:
-            spaceship_duration -= total_spaceship_duration
-
-            reset_scene()
-            obj = generate_spaceship()
-
-            lowest_z = min((Vector(b).z for b in obj.bound_box))
-            plane_obj = bpy.data.objects["Plane"] if "Plane" in bpy.data.objects else None
-            if plane_obj:
-                plane_obj.location.z = lowest_z - 0.3
-
-        rad = radians(yaw_offset + (yaw_rate * movie_duration))
-        camera_pole_pitch_lerp = 0.5 * (1 + cos(camera_pole_rate * movie_duration))
-        camera_pole_pitch = camera_pole_pitch_max * camera_pole_pitch_lerp + \
-            camera_pole_pitch_min * (1 - camera_pole_pitch_lerp)
-        scene.camera.rotation_euler = (
-            radians(90 - camera_pole_pitch + camera_pole_pitch_offset),
-            0,
-            rad,
-        )
-        scene.camera.location = (
-            sin(rad) * camera_pole_length,
-            cos(rad) * -camera_pole_length,
-            sin(radians(camera_pole_pitch)) * camera_pole_length,
-        )
-        if camera_refocus_object_every_frame:
-            bpy.ops.view3d.camera_to_view_selected()
-
-        script_path = bpy.context.space_data.text.filepath if bpy.context.space_data else __file__
-        folder = output_path if output_path else os.path.split(os.path.realpath(script_path))[0]
-        filename = os.path.join("renders", timestamp, timestamp + "_" + str(frame).zfill(5) + ".png")
-        bpy.data.scenes["Scene"].render.filepath = os.path.join(folder, filename)
-        print("Rendering frame " + str(frame) + "...")
-        bpy.ops.render.render(write_still=True)
-        frame += 1
+    frame_writer = None
+    obj = None
+    with ExitStack() as stack:
+        stack.enter_context(standard_view_transform(scene))
+        if async_frame_writes or frame_pipe_command:
+            stack.enter_context(viewer_node(scene))
+            frame_writer = stack.enter_context(FrameWriter(pipe_command=frame_pipe_command))
+        while movie_duration < total_movie_duration:
+            movie_duration += inv_fps
+            spaceship_duration += inv_fps
+            if spaceship_duration >= total_spaceship_duration:
+                spaceship_duration -= total_spaceship_duration
+
+                if obj is None or not pool_objects:
+                    reset_scene()
+                    if memory_profiler is not None:
+                        memory_profiler.record("reset", frame=frame)
+                    obj = None
+                obj = generate_spaceship(memory_profiler=memory_profiler, reuse_object=obj)
+
+                lowest_z = min((Vector(b).z for b in obj.bound_box))
+                plane_obj = bpy.data.objects["Plane"] if "Plane" in bpy.data.objects else None
+                if plane_obj:
+                    plane_obj.location.z = lowest_z - 0.3
+
+            rad = radians(yaw_offset + (yaw_rate * movie_duration))
+            camera_pole_pitch_lerp = 0.5 * (1 + cos(camera_pole_rate * movie_duration))
+            camera_pole_pitch = camera_pole_pitch_max * camera_pole_pitch_lerp + \
+                camera_pole_pitch_min * (1 - camera_pole_pitch_lerp)
+            scene.camera.rotation_euler = (
+                radians(90 - camera_pole_pitch + camera_pole_pitch_offset),
+                0,
+                rad,
+            )
+            scene.camera.location = (
+                sin(rad) * camera_pole_length,
+                cos(rad) * -camera_pole_length,
+                sin(radians(camera_pole_pitch)) * camera_pole_length,
+            )
+            if camera_refocus_object_every_frame:
+                bpy.ops.view3d.camera_to_view_selected()
+
+            script_path = bpy.context.space_data.text.filepath if bpy.context.space_data else __file__
+            folder = output_path if output_path else os.path.split(os.path.realpath(script_path))[0]
+            filename = os.path.join("renders", timestamp, timestamp + "_" + str(frame).zfill(5) + ".png")
+            print("Rendering frame " + str(frame) + "...")
+            if frame_writer is None:
+                bpy.data.scenes["Scene"].render.filepath = os.path.join(folder, filename)
+                bpy.ops.render.render(write_still=True)
+            else:
+                bpy.ops.render.render()
+                pixels, width, height = read_viewer_pixels(bpy.data.images["Viewer Node"])
+                frame_writer.submit(os.path.join(folder, filename), pixels, width, height)
+            frame += 1
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from math import cos, pi, radians, sin, sqrt
 from random import randint, random, uniform
+from contextlib import contextmanager
 from functools import wraps
 
 try:  # pragma: no cover - Blender specific
@@ -16,6 +17,14 @@ except Exception:  # pragma: no cover
 from .materials import Material
 
 
+def _is_valid_face(face, min_verts: int) -> bool:
+    return (
+        face is not None
+        and getattr(face, "is_valid", False)
+        and len(face.verts) >= min_verts
+    )
+
+
 def require_valid_face(min_verts: int = 3, default=None):
     """Decorator to skip operations on invalid faces."""
 
@@ -25,11 +34,7 @@ def require_valid_face(min_verts: int = 3, default=None):
             face = kwargs.get("face")
             if face is None:
                 face = args[-1]
-            if (
-                face is None
-                or not getattr(face, "is_valid", False)
-                or len(face.verts) < min_verts
-            ):
+            if not _is_valid_face(face, min_verts):
                 return default
             return func(*args, **kwargs)
 
@@ -38,9 +43,113 @@ def require_valid_face(min_verts: int = 3, default=None):
     return decorator
 
 
+class FaceMetrics:
+    """Measurements of a single face, each computed on first use."""
+
+    __slots__ = ("aspect_ratio", "size", "basis")
+
+    def __init__(self):
+        self.aspect_ratio = None
+        self.size = None
+        self.basis = None
+
+
+# The active cache, keyed by BMFace, which hashes by the underlying
+# element. It only exists inside ``face_metrics_cache`` or while a
+# ``cached_face_metrics`` generator runs, so entries never outlive the
+# BMesh they describe; within it, entries must be dropped whenever a face
+# is transformed or removed, see ``invalidate_face_metrics``.
+_face_metrics = None
+
+
+@contextmanager
+def face_metrics_cache():
+    """Cache face metrics for the duration of the ``with`` block.
+
+    Use one block per BMesh and leave it before the BMesh is freed.
+    Outside a block, metrics are computed on every call.
+    """
+
+    global _face_metrics
+    previous, _face_metrics = _face_metrics, {}
+    try:
+        yield
+    finally:
+        _face_metrics = previous
+
+
+def cached_face_metrics(generator_function):
+    """Give every generator made by ``generator_function`` its own cache.
+
+    The cache is only active while the generator runs and is swapped out
+    whenever it yields, so generators stepped in turn, like the fleet
+    operator's, never see or invalidate each other's entries.
+    """
+
+    @wraps(generator_function)
+    def wrapper(*args, **kwargs):
+        return _run_with_face_metrics(generator_function(*args, **kwargs), {})
+
+    return wrapper
+
+
+def _run_with_face_metrics(steps, cache):
+    global _face_metrics
+    try:
+        while True:
+            previous, _face_metrics = _face_metrics, cache
+            try:
+                stage = next(steps)
+            except StopIteration as done:
+                return done.value
+            finally:
+                _face_metrics = previous
+            yield stage
+    finally:
+        previous, _face_metrics = _face_metrics, cache
+        try:
+            steps.close()
+        finally:
+            _face_metrics = previous
+
+
+def _get_face_metrics(face) -> FaceMetrics:
+    if _face_metrics is None:
+        return FaceMetrics()
+    metrics = _face_metrics.get(face)
+    if metrics is None:
+        metrics = _face_metrics[face] = FaceMetrics()
+    return metrics
+
+
+def _cached_face_metrics(face):
+    return _face_metrics.get(face) if _face_metrics else None
+
+
+def invalidate_face_metrics(faces=None, linked: bool = True) -> None:
+    """Forget cached metrics for ``faces``, or for every face if ``None``.
+
+    With ``linked`` set, faces sharing a vertex with ``faces`` are forgotten
+    too, since moving a face's vertices also reshapes its neighbours.
+    """
+
+    if not _face_metrics:
+        return
+    if faces is None:
+        _face_metrics.clear()
+        return
+    for face in faces:
+        _face_metrics.pop(face, None)
+        if linked and face.is_valid:
+            for vert in face.verts:
+                for linked_face in vert.link_faces:
+                    _face_metrics.pop(linked_face, None)
+
+
 def extrude_face(bm, face, translate_forwards: float = 0.0, extruded_face_list=None):
     """Extrude ``face`` along its normal and return the new face."""
 
+    invalidate_face_metrics([face], linked=False)
     new_faces = bmesh.ops.extrude_discrete_faces(bm, faces=[face])["faces"]
     if extruded_face_list is not None:
         extruded_face_list += new_faces[:]
@@ -51,6 +160,40 @@ def extrude_face(bm, face, translate_forwards: float = 0.0, extruded_face_list=N
     return new_face
 
 
+def extrude_faces(bm, faces, translate_forwards, scales=None):
+    """Extrude all ``faces`` with a single operator call.
+
+    Equivalent to calling :func:`extrude_face` on each face followed by a
+    uniform :func:`scale_face`, with one distance in ``translate_forwards``
+    and one factor in ``scales`` per face. The new faces are returned in
+    the order of ``faces``.
+    """
+
+    if not faces:
+        return []
+    # The operator returns the copied faces in mesh order, not input order.
+    # Copies keep their source's custom data, so tag each source with its
+    # position in ``faces``.
+    layer = bm.faces.layers.int.new("extrude_faces_index")
+    try:
+        for i, face in enumerate(faces):
+            face[layer] = i
+        invalidate_face_metrics(faces, linked=False)
+        new_faces = [None] * len(faces)
+        for new_face in bmesh.ops.extrude_discrete_faces(bm, faces=faces)["faces"]:
+            new_faces[new_face[layer]] = new_face
+    finally:
+        bm.faces.layers.int.remove(layer)
+
+    for i, new_face in enumerate(new_faces):
+        offset = new_face.normal * translate_forwards[i]
+        scale = 1.0 if scales is None else scales[i]
+        origin = new_face.verts[0].co.copy()
+        for vert in new_face.verts:
+            vert.co = origin + offset + (vert.co - origin) * scale
+    return new_faces
+
+
 def ribbed_extrude_face(bm, face, translate_forwards, num_ribs: int = 3, rib_scale: float = 0.9):
     """Extrude a face creating evenly spaced ribs."""
 
@@ -78,35 +221,55 @@ def scale_face(bm, face, scale_x: float, scale_y: float, scale_z: float):
         space=face_space,
         verts=face.verts,
     )
+    invalidate_face_metrics([face])
 
 
 def get_face_matrix(face, pos=None):
     """Return an approximate transform matrix for ``face``."""
 
-    x_axis = (face.verts[1].co - face.verts[0].co).normalized()
-    normal = face.normal
-    y_axis = normal.cross(x_axis).normalized()
+    metrics = _get_face_metrics(face)
+    if metrics.basis is None:
+        x_axis = (face.verts[1].co - face.verts[0].co).normalized()
+        normal = face.normal
+        y_axis = normal.cross(x_axis).normalized()
+        metrics.basis = Matrix((x_axis, y_axis, normal)).to_4x4()
     if pos is None:
         pos = face.verts[0].co
-    mat = Matrix((x_axis, y_axis, normal)).to_4x4()
+    mat = metrics.basis.copy()
     mat.translation = pos
     return mat
 
 
-@require_valid_face(min_verts=3, default=(0.0, 0.0))
 def get_face_width_and_height(face):
+    metrics = _cached_face_metrics(face)
+    if metrics is not None and metrics.size is not None:
+        return metrics.size
+    return _calc_face_width_and_height(face)
+
+
+@require_valid_face(min_verts=3, default=(0.0, 0.0))
+def _calc_face_width_and_height(face):
     v0 = face.verts[0].co
     width = (face.verts[1].co - v0).length
     far_vert = max(face.verts[2:], key=lambda v: (v.co - v0).length)
     height = (far_vert.co - v0).length
+    _get_face_metrics(face).size = (width, height)
     return width, height
 
 
-@require_valid_face(default=1.0)
 def get_aspect_ratio(face) -> float:
+    metrics = _cached_face_metrics(face)
+    if metrics is not None and metrics.aspect_ratio is not None:
+        return metrics.aspect_ratio
+    return _calc_aspect_ratio(face)
+
+
+@require_valid_face(default=1.0)
+def _calc_aspect_ratio(face) -> float:
     face_aspect_ratio = max(0.01, face.edges[0].calc_length() / face.edges[1].calc_length())
     if face_aspect_ratio < 1.0:
         face_aspect_ratio = 1.0 / face_aspect_ratio
+    _get_face_metrics(face).aspect_ratio = face_aspect_ratio
     return face_aspect_ratio
 
 
@@ -117,6 +280,7 @@ def is_rear_face(face) -> bool:
 @require_valid_face()
 def add_exhaust_to_face(bm, face):
     num_cuts = randint(1, int(4 - get_aspect_ratio(face)))
+    invalidate_face_metrics([face])
     result = bmesh.ops.subdivide_edges(
         bm, edges=face.edges[:], cuts=num_cuts, fractal=0.02, use_grid_fill=True
     )
@@ -139,6 +303,7 @@ def add_exhaust_to_face(bm, face):
 
 @require_valid_face()
 def add_grid_to_face(bm, face):
+    invalidate_face_metrics([face])
     result = bmesh.ops.subdivide_edges(
         bm,
         edges=face.edges[:],
@@ -159,8 +324,43 @@ def add_grid_to_face(bm, face):
                     extruded_face.material_index = material_index
             scale_face(bm, face, scale, scale, scale)
 
+
+def add_grid_to_faces(bm, faces):
+    """Batched :func:`add_grid_to_face` extruding the cells of each face at once.
+
+    Every face is subdivided and its cells extruded before the next face is
+    subdivided, so the result matches calling :func:`add_grid_to_face` on
+    each face in turn.
+    """
+
+    for face in faces:
+        if not _is_valid_face(face, 3):
+            continue
+        invalidate_face_metrics([face])
+        result = bmesh.ops.subdivide_edges(
+            bm,
+            edges=face.edges[:],
+            cuts=randint(2, 4),
+            fractal=0.02,
+            use_grid_fill=True,
+            use_single_edge=False,
+        )
+        grid_length = uniform(0.025, 0.15)
+        cells = []
+        material_indices = []
+        for cell in result["geom"]:
+            if isinstance(cell, bmesh.types.BMFace):
+                cells.append(cell)
+                material_indices.append(Material.hull_lights if random() > 0.5 else Material.hull)
+
+        new_faces = extrude_faces(bm, cells, [grid_length] * len(cells), [0.8] * len(cells))
+        for new_face, material_index in zip(new_faces, material_indices):
+            if abs(new_face.normal.z) < 0.707:
+                new_face.material_index = material_index
+
+
 @require_valid_face(min_verts=4)
-def add_cylinders_to_face(bm, face):
+def add_cylinders_to_face(bm, face, *, greeble_verts=None):
     horizontal_step = randint(1, 3)
     vertical_step = randint(1, 3)
     num_segments = randint(6, 12)
@@ -179,7 +379,7 @@ def add_cylinders_to_face(bm, face):
         for v in range(vertical_step):
             pos = top.lerp(bottom, (v + 1) / float(vertical_step + 1))
             cylinder_matrix = get_face_matrix(face, pos) @ Matrix.Rotation(radians(90), 3, "X").to_4x4()
-            bmesh.ops.create_cone(
+            cylinder = bmesh.ops.create_cone(
                 bm,
                 cap_ends=True,
                 cap_tris=False,
@@ -189,9 +389,11 @@ def add_cylinders_to_face(bm, face):
                 depth=cylinder_depth,
                 matrix=cylinder_matrix,
             )
+            if greeble_verts is not None:
+                greeble_verts.append(cylinder["verts"])
 
 @require_valid_face(min_verts=4)
-def add_weapons_to_face(bm, face):
+def add_weapons_to_face(bm, face, *, greeble_verts=None):
     horizontal_step = randint(1, 2)
     vertical_step = randint(1, 2)
     num_segments = 16
@@ -224,7 +426,7 @@ def add_weapons_to_face(bm, face):
             barrel_matrix = base_matrix @ Matrix.Translation(
                 (0, 0, weapon_depth * 0.5)
             ) @ Matrix.Rotation(radians(randint(-45, 45)), 3, "Z").to_4x4()
-            bmesh.ops.create_cone(
+            turret_barrel = bmesh.ops.create_cone(
                 bm,
                 cap_ends=True,
                 cap_tris=False,
@@ -233,21 +435,25 @@ def add_weapons_to_face(bm, face):
                 diameter2=weapon_size * 0.25,
                 depth=weapon_size,
                 matrix=barrel_matrix,
-            )
+            )["verts"]
+            if greeble_verts is not None:
+                greeble_verts.append(turret_base + turret_barrel)
 
 @require_valid_face(min_verts=4)
-def add_sphere_to_face(bm, face):
+def add_sphere_to_face(bm, face, *, greeble_verts=None):
     face_width, face_height = get_face_width_and_height(face)
     size = min(face_width, face_height)
     matrix = get_face_matrix(face) @ Matrix.Translation((0, 0, size * 0.5))
-    bmesh.ops.create_uvsphere(bm, u_segments=8, v_segments=8, diameter=size, matrix=matrix)
+    sphere = bmesh.ops.create_uvsphere(bm, u_segments=8, v_segments=8, diameter=size, matrix=matrix)
+    if greeble_verts is not None:
+        greeble_verts.append(sphere["verts"])
 
 @require_valid_face(min_verts=4)
-def add_surface_antenna_to_face(bm, face):
+def add_surface_antenna_to_face(bm, face, *, greeble_verts=None):
     face_width, face_height = get_face_width_and_height(face)
     size = min(face_width, face_height)
     matrix = get_face_matrix(face) @ Matrix.Translation((0, 0, size * 0.5))
-    bmesh.ops.create_cone(
+    antenna = bmesh.ops.create_cone(
         bm,
         cap_ends=True,
         cap_tris=False,
@@ -257,6 +463,8 @@ def add_surface_antenna_to_face(bm, face):
         depth=size,
         matrix=matrix,
     )
+    if greeble_verts is not None:
+        greeble_verts.append(antenna["verts"])
 
 @require_valid_face(min_verts=4)
 def add_disc_to_face(bm, face):
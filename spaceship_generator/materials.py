@@ -11,6 +11,7 @@ try:  # pragma: no cover - Blender specific
 except Exception:  # pragma: no cover
     bpy = None  # type: ignore
 
+from .atlas import ensure_atlas
 from .utils import resource_path
 
 
@@ -36,7 +37,18 @@ def get_shader_input(mat, name):  # pragma: no cover - Blender specific
     return shader_node.inputs[name]
 
 
-def add_hull_normal_map(mat, hull_normal_map):  # pragma: no cover - Blender specific
+def link_texture_coordinates(mat, tex_coords_node, teximage_node, use_uvs=False):  # pragma: no cover - Blender specific
+    """Sample ``teximage_node`` with baked UVs, or box-projected object coordinates."""
+
+    if use_uvs:
+        teximage_node.projection = "FLAT"
+        mat.node_tree.links.new(tex_coords_node.outputs["UV"], teximage_node.inputs["Vector"])
+    else:
+        teximage_node.projection = "BOX"
+        mat.node_tree.links.new(tex_coords_node.outputs["Object"], teximage_node.inputs["Vector"])
+
+
+def add_hull_normal_map(mat, hull_normal_map, use_uvs=False):  # pragma: no cover - Blender specific
     ntree = mat.node_tree
     shader = get_shader_node(mat)
     links = ntree.links
@@ -44,24 +56,159 @@ def add_hull_normal_map(mat, hull_normal_map):  # pragma: no cover - Blender spe
     teximage_node = ntree.nodes.new("ShaderNodeTexImage")
     teximage_node.image = hull_normal_map
     teximage_node.image.colorspace_settings.name = "Raw"
-    teximage_node.projection = "BOX"
     tex_coords_node = ntree.nodes.new("ShaderNodeTexCoord")
-    links.new(tex_coords_node.outputs["Object"], teximage_node.inputs["Vector"])
+    link_texture_coordinates(mat, tex_coords_node, teximage_node, use_uvs)
     normalMap_node = ntree.nodes.new("ShaderNodeNormalMap")
     links.new(teximage_node.outputs[0], normalMap_node.inputs["Color"])
     links.new(normalMap_node.outputs["Normal"], shader.inputs["Normal"])
     return tex_coords_node
 
 
-def set_hull_mat_basics(mat, color, hull_normal_map):  # pragma: no cover - Blender specific
+def _new_group_socket(group, name, socket_type, in_out="OUTPUT"):  # pragma: no cover - Blender specific
+    if hasattr(group, "interface"):  # Blender 4.0+
+        return group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    sockets = group.outputs if in_out == "OUTPUT" else group.inputs
+    return sockets.new(socket_type, name)
+
+
+def _new_separate_color(nodes):  # pragma: no cover - Blender specific
+    try:
+        return nodes.new("ShaderNodeSeparateColor")
+    except RuntimeError:  # Before Blender 3.3
+        return nodes.new("ShaderNodeSeparateRGB")
+
+
+def get_hull_atlas_group(atlas_image, use_uvs=False):  # pragma: no cover - Blender specific
+    """Return the node group unpacking the hull texture atlas, creating it once.
+
+    The group samples the atlas a single time and outputs ``Normal``,
+    ``Diffuse`` and ``Emission`` for the hull materials to share. Diffuse
+    and emission brightness are stored gamma encoded and linearized with
+    a 2.2 gamma.
+    """
+
+    name = "Spaceship Hull Atlas UV" if use_uvs else "Spaceship Hull Atlas"
+    group = bpy.data.node_groups.get(name)
+    if group is not None:
+        return group
+
+    group = bpy.data.node_groups.new(name, "ShaderNodeTree")
+    _new_group_socket(group, "Normal", "NodeSocketVector")
+    _new_group_socket(group, "Diffuse", "NodeSocketColor")
+    _new_group_socket(group, "Emission", "NodeSocketColor")
+    nodes, links = group.nodes, group.links
+    output = nodes.new("NodeGroupOutput")
+
+    tex_coords = nodes.new("ShaderNodeTexCoord")
+    teximage = nodes.new("ShaderNodeTexImage")
+    teximage.image = atlas_image
+    if use_uvs:
+        teximage.projection = "FLAT"
+        links.new(tex_coords.outputs["UV"], teximage.inputs["Vector"])
+    else:
+        teximage.projection = "BOX"
+        links.new(tex_coords.outputs["Object"], teximage.inputs["Vector"])
+    channels = _new_separate_color(nodes)
+    links.new(teximage.outputs["Color"], channels.inputs[0])
+
+    # Rebuild the normal map color: z = sqrt(1 - x^2 - y^2), remapped to 0..1.
+    x = nodes.new("ShaderNodeMath")
+    x.operation = "MULTIPLY_ADD"
+    links.new(channels.outputs[0], x.inputs[0])
+    x.inputs[1].default_value = 2.0
+    x.inputs[2].default_value = -1.0
+    y = nodes.new("ShaderNodeMath")
+    y.operation = "MULTIPLY_ADD"
+    links.new(channels.outputs[1], y.inputs[0])
+    y.inputs[1].default_value = 2.0
+    y.inputs[2].default_value = -1.0
+    xy = nodes.new("ShaderNodeVectorMath")
+    xy.operation = "DOT_PRODUCT"
+    combine_xy = nodes.new("ShaderNodeCombineXYZ")
+    links.new(x.outputs[0], combine_xy.inputs["X"])
+    links.new(y.outputs[0], combine_xy.inputs["Y"])
+    links.new(combine_xy.outputs[0], xy.inputs[0])
+    links.new(combine_xy.outputs[0], xy.inputs[1])
+    z = nodes.new("ShaderNodeMath")
+    z.operation = "SUBTRACT"
+    z.inputs[0].default_value = 1.0
+    links.new(xy.outputs["Value"], z.inputs[1])
+    z_root = nodes.new("ShaderNodeMath")
+    z_root.operation = "SQRT"
+    z_root.use_clamp = True
+    links.new(z.outputs[0], z_root.inputs[0])
+    z_color = nodes.new("ShaderNodeMath")
+    z_color.operation = "MULTIPLY_ADD"
+    links.new(z_root.outputs[0], z_color.inputs[0])
+    z_color.inputs[1].default_value = 0.5
+    z_color.inputs[2].default_value = 0.5
+    normal_color = nodes.new("ShaderNodeCombineXYZ")
+    links.new(channels.outputs[0], normal_color.inputs["X"])
+    links.new(channels.outputs[1], normal_color.inputs["Y"])
+    links.new(z_color.outputs[0], normal_color.inputs["Z"])
+    normal_map = nodes.new("ShaderNodeNormalMap")
+    links.new(normal_color.outputs[0], normal_map.inputs["Color"])
+    links.new(normal_map.outputs["Normal"], output.inputs["Normal"])
+
+    for source, socket in ((channels.outputs[2], "Diffuse"), (teximage.outputs["Alpha"], "Emission")):
+        gamma = nodes.new("ShaderNodeGamma")
+        links.new(source, gamma.inputs["Color"])
+        gamma.inputs["Gamma"].default_value = 2.2
+        links.new(gamma.outputs["Color"], output.inputs[socket])
+    return group
+
+
+def add_hull_atlas(mat, atlas_group):  # pragma: no cover - Blender specific
+    """Add ``atlas_group`` to ``mat`` and drive the shader's normal with it."""
+
+    group_node = mat.node_tree.nodes.new("ShaderNodeGroup")
+    group_node.node_tree = atlas_group
+    mat.node_tree.links.new(group_node.outputs["Normal"], get_shader_input(mat, "Normal"))
+    return group_node
+
+
+def set_hull_mat_basics(mat, color, hull_normal_map, use_uvs=False, atlas_group=None):  # pragma: no cover - Blender specific
     shader_node = get_shader_node(mat)
     shader_node.inputs["Specular"].default_value = 0.1
     shader_node.inputs["Base Color"].default_value = color
 
-    return add_hull_normal_map(mat, hull_normal_map)
+    if atlas_group is not None:
+        return add_hull_atlas(mat, atlas_group)
+    return add_hull_normal_map(mat, hull_normal_map, use_uvs)
+
+
+def random_hull_color():
+    """Draw a random hull color as RGBA, the only random draw of :func:`create_materials`."""
+
+    r, g, b = hls_to_rgb(random(), uniform(0.05, 0.5), uniform(0, 0.25))
+    return (r, g, b, 1.0)
+
+
+def dark_hull_color(color):
+    return (color[0] * 0.1, color[1] * 0.1, color[2] * 0.1, 1.0)
+
+
+def update_hull_color(materials, color):  # pragma: no cover - Blender specific
+    """Recolor materials made by :func:`create_materials` in place."""
+
+    for slot, slot_color in (
+        (Material.hull, color),
+        (Material.hull_lights, color),
+        (Material.hull_dark, dark_hull_color(color)),
+    ):
+        get_shader_input(materials[slot], "Base Color").default_value = slot_color
 
 
-def create_materials():  # pragma: no cover - Blender specific
+def create_materials(use_uvs=False, use_atlas=False):  # pragma: no cover - Blender specific
+    """Create one material per :class:`Material` slot.
+
+    With ``use_uvs`` the hull textures are looked up through the mesh's UV
+    layer (see ``MeshData.cube_project_uvs``) instead of being
+    box-projected per shading sample. With ``use_atlas`` the hull
+    materials share one node group sampling the packed texture atlas
+    (see :mod:`~spaceship_generator.atlas`) once per shading point.
+    """
+
     ret = []
 
     for material in Material:
@@ -69,51 +216,56 @@ def create_materials():  # pragma: no cover - Blender specific
         mat.use_nodes = True
         ret.append(mat)
 
-    hull_base_color = hls_to_rgb(random(), uniform(0.05, 0.5), uniform(0, 0.25))
-    hull_base_color = (
-        hull_base_color[0],
-        hull_base_color[1],
-        hull_base_color[2],
-        1.0,
-    )
+    hull_base_color = random_hull_color()
 
-    hull_normal_map = bpy.data.images.load(
-        resource_path("textures", "hull_normal.png"), check_existing=True
-    )
+    hull_normal_map = atlas_group = None
+    if use_atlas:
+        atlas_image = bpy.data.images.load(ensure_atlas(), check_existing=True)
+        atlas_image.colorspace_settings.name = "Non-Color"
+        atlas_image.alpha_mode = "CHANNEL_PACKED"
+        atlas_group = get_hull_atlas_group(atlas_image, use_uvs)
+    else:
+        hull_normal_map = bpy.data.images.load(
+            resource_path("textures", "hull_normal.png"), check_existing=True
+        )
 
     mat = ret[Material.hull]
-    set_hull_mat_basics(mat, hull_base_color, hull_normal_map)
+    set_hull_mat_basics(mat, hull_base_color, hull_normal_map, use_uvs, atlas_group)
 
     mat = ret[Material.hull_lights]
-    coords_node = set_hull_mat_basics(mat, hull_base_color, hull_normal_map)
-    hull_lights_diffuse = bpy.data.images.load(
-        resource_path("textures", "hull_lights_diffuse.png"), check_existing=True
-    )
-    hull_lights_emit = bpy.data.images.load(
-        resource_path("textures", "hull_lights_emit.png"), check_existing=True
-    )
+    coords_node = set_hull_mat_basics(mat, hull_base_color, hull_normal_map, use_uvs, atlas_group)
     ntree = mat.node_tree
     shader = get_shader_node(mat)
     links = ntree.links
-    teximage_node = ntree.nodes.new("ShaderNodeTexImage")
-    teximage_node.image = hull_lights_diffuse
-    teximage_node.image.colorspace_settings.name = "sRGB"
-    teximage_node.projection = "BOX"
-    links.new(coords_node.outputs["Object"], teximage_node.inputs["Vector"])
-    links.new(teximage_node.outputs[0], shader.inputs["Base Color"])
-    teximage_node = ntree.nodes.new("ShaderNodeTexImage")
-    teximage_node.image = hull_lights_emit
-    teximage_node.image.colorspace_settings.name = "sRGB"
-    teximage_node.projection = "BOX"
-    links.new(coords_node.outputs["Object"], teximage_node.inputs["Vector"])
-    links.new(teximage_node.outputs[0], shader.inputs["Emission"])
+    if atlas_group is not None:
+        links.new(coords_node.outputs["Diffuse"], shader.inputs["Base Color"])
+        links.new(coords_node.outputs["Emission"], shader.inputs["Emission"])
+    else:
+        hull_lights_diffuse = bpy.data.images.load(
+            resource_path("textures", "hull_lights_diffuse.png"), check_existing=True
+        )
+        hull_lights_emit = bpy.data.images.load(
+            resource_path("textures", "hull_lights_emit.png"), check_existing=True
+        )
+        teximage_node = ntree.nodes.new("ShaderNodeTexImage")
+        teximage_node.image = hull_lights_diffuse
+        teximage_node.image.colorspace_settings.name = "sRGB"
+        link_texture_coordinates(mat, coords_node, teximage_node, use_uvs)
+        links.new(teximage_node.outputs[0], shader.inputs["Base Color"])
+        teximage_node = ntree.nodes.new("ShaderNodeTexImage")
+        teximage_node.image = hull_lights_emit
+        teximage_node.image.colorspace_settings.name = "sRGB"
+        link_texture_coordinates(mat, coords_node, teximage_node, use_uvs)
+        links.new(teximage_node.outputs[0], shader.inputs["Emission"])
     shader.inputs["Emission Strength"].default_value = 5
 
     mat = ret[Material.hull_dark]
     set_hull_mat_basics(
         mat,
-        (hull_base_color[0] * 0.1, hull_base_color[1] * 0.1, hull_base_color[2] * 0.1, 1.0),
+        dark_hull_color(hull_base_color),
         hull_normal_map,
+        use_uvs,
+        atlas_group,
     )
 
     mat = ret[Material.exhaust_burn]
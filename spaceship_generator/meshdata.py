@@ -0,0 +1,253 @@
+"""Flat array representation of generated meshes.
+
+:class:`MeshData` holds a polygon mesh as a handful of NumPy arrays, the
+same layout Blender uses internally, so it can be copied in and out of
+``bpy.types.Mesh`` with bulk ``foreach_get``/``foreach_set`` calls.
+"""
+
+from __future__ import annotations
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - NumPy ships with Blender
+    np = None  # type: ignore
+
+try:  # pragma: no cover - Blender specific
+    import bpy  # type: ignore
+except Exception:  # pragma: no cover
+    bpy = None  # type: ignore
+
+
+class MeshData:
+    """Vertices, polygons and material indices of a mesh as flat arrays.
+
+    ``face_sizes`` holds the number of corners of each polygon and
+    ``face_vertices`` the vertex index of every corner, polygon after
+    polygon. ``uvs``, if set, holds one UV per corner.
+    """
+
+    __slots__ = ("vertices", "face_sizes", "face_vertices", "material_indices", "uvs")
+
+    def __init__(self, vertices, face_sizes, face_vertices, material_indices=None, uvs=None):
+        self.vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+        self.face_sizes = np.asarray(face_sizes, dtype=np.int32).reshape(-1)
+        self.face_vertices = np.asarray(face_vertices, dtype=np.int32).reshape(-1)
+        if material_indices is None:
+            material_indices = np.zeros(len(self.face_sizes), dtype=np.int32)
+        self.material_indices = np.asarray(material_indices, dtype=np.int32).reshape(-1)
+        self.uvs = None if uvs is None else np.asarray(uvs, dtype=np.float32).reshape(-1, 2)
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def num_faces(self) -> int:
+        return len(self.face_sizes)
+
+    @property
+    def num_loops(self) -> int:
+        return len(self.face_vertices)
+
+    @property
+    def face_starts(self):
+        """Index into ``face_vertices`` of each polygon's first corner."""
+
+        starts = np.zeros(len(self.face_sizes), dtype=np.int32)
+        np.cumsum(self.face_sizes[:-1], out=starts[1:])
+        return starts
+
+    @property
+    def loop_faces(self):
+        """Polygon index of every corner."""
+
+        return np.repeat(np.arange(self.num_faces, dtype=np.int32), self.face_sizes)
+
+    def _face_normal_vectors(self):
+        # Newell's method; each vector's length is twice the polygon's area.
+        if not self.num_faces:
+            return np.zeros((0, 3), dtype=np.float64)
+        starts = self.face_starts
+        next_loops = np.arange(1, self.num_loops + 1)
+        next_loops[starts + self.face_sizes - 1] = starts
+        corners = self.vertices[self.face_vertices].astype(np.float64)
+        return np.add.reduceat(np.cross(corners, corners[next_loops]), starts, axis=0)
+
+    def face_normals(self):
+        """Return the unit normal of every polygon."""
+
+        normals = self._face_normal_vectors()
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        return (normals / np.where(lengths > 0, lengths, 1.0)).astype(np.float32)
+
+    def split_normals(self, hard_edge_angle: float = 180.0):
+        """Return a smooth normal for every corner, keeping hard edges sharp.
+
+        Each corner averages the area-weighted normals of the polygons
+        around its vertex whose normal is within ``hard_edge_angle``
+        degrees of its own polygon's normal.
+        """
+
+        weighted = self._face_normal_vectors()
+        unit = self.face_normals().astype(np.float64)
+        loop_faces = self.loop_faces
+        # Pair every corner with every corner sharing its vertex.
+        order = np.argsort(self.face_vertices, kind="stable")
+        counts = np.bincount(self.face_vertices, minlength=self.num_vertices)
+        group_starts = np.cumsum(counts) - counts
+        sorted_vertices = self.face_vertices[order]
+        repeats = counts[sorted_vertices]
+        src_pos = np.repeat(np.arange(self.num_loops), repeats)
+        within = np.arange(len(src_pos)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        dst_pos = group_starts[sorted_vertices][src_pos] + within
+        src_faces = loop_faces[order[src_pos]]
+        dst_faces = loop_faces[order[dst_pos]]
+
+        cos_threshold = np.cos(np.radians(min(hard_edge_angle, 180.0)))
+        keep = np.einsum("ij,ij->i", unit[src_faces], unit[dst_faces]) >= cos_threshold - 1e-6
+        src_loops = order[src_pos][keep]
+        contributions = weighted[dst_faces[keep]]
+        normals = np.stack(
+            [np.bincount(src_loops, weights=contributions[:, k], minlength=self.num_loops) for k in range(3)],
+            axis=1,
+        )
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = np.where(lengths > 0, normals / np.where(lengths > 0, lengths, 1.0), unit[loop_faces])
+        return normals.astype(np.float32)
+
+    def cube_project_uvs(self):
+        """Return per-corner UVs projected along each polygon's dominant axis.
+
+        This bakes what an image texture with ``BOX`` projection of object
+        coordinates samples, with the axis picked once per polygon.
+        """
+
+        normals = self.face_normals()[self.loop_faces]
+        corners = self.vertices[self.face_vertices]
+        rows = np.arange(self.num_loops)
+        axis = np.argmax(np.abs(normals), axis=1)
+        # Same axes and flips as Blender's box mapping: X -> (y, z),
+        # Y -> (x, z), Z -> (y, x).
+        u = corners[rows, np.array([1, 0, 1])[axis]]
+        v = corners[rows, np.array([2, 2, 0])[axis]]
+        sign = normals[rows, axis]
+        u = np.where(np.where(axis == 0, sign < 0, sign > 0), 1.0 - u, u)
+        return np.stack([u, v], axis=1).astype(np.float32)
+
+    @classmethod
+    def from_mesh(cls, mesh) -> "MeshData":  # pragma: no cover - Blender specific
+        """Copy the geometry of a ``bpy.types.Mesh``."""
+
+        vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", vertices)
+        face_sizes = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", face_sizes)
+        face_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", face_vertices)
+        material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", material_indices)
+        uvs = None
+        if mesh.uv_layers.active is not None:
+            uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            mesh.uv_layers.active.data.foreach_get("uv", uvs)
+        return cls(vertices, face_sizes, face_vertices, material_indices, uvs)
+
+    def to_mesh(self, mesh=None, name: str = "Spaceship"):
+        """Write the geometry into ``mesh``, or a new mesh, without a BMesh.
+
+        Any geometry already in ``mesh`` is replaced. Everything is copied
+        with bulk ``foreach_set`` calls and edges are derived by Blender.
+        """
+
+        if mesh is None:
+            mesh = bpy.data.meshes.new(name)
+        else:
+            mesh.clear_geometry()
+        mesh.vertices.add(self.num_vertices)
+        mesh.vertices.foreach_set("co", self.vertices.ravel())
+        mesh.loops.add(self.num_loops)
+        mesh.loops.foreach_set("vertex_index", self.face_vertices)
+        mesh.polygons.add(self.num_faces)
+        mesh.polygons.foreach_set("loop_start", self.face_starts)
+        try:
+            mesh.polygons.foreach_set("loop_total", self.face_sizes)
+        except Exception:  # pragma: no cover - read-only, derived from loop_start in newer Blender
+            pass
+        mesh.polygons.foreach_set("material_index", self.material_indices)
+        if self.uvs is not None:
+            write_uvs(mesh, self.uvs)
+        mesh.update(calc_edges=True)
+        return mesh
+
+
+def write_uvs(mesh, uvs, name: str = "UVMap"):
+    """Store per-corner ``uvs`` in the UV layer ``name`` of ``mesh``."""
+
+    uv_layer = mesh.uv_layers.get(name) or mesh.uv_layers.new(name=name)
+    uv_layer.data.foreach_set("uv", np.asarray(uvs, dtype=np.float32).ravel())
+    return uv_layer
+
+
+def write_normals(mesh, loop_normals=None):
+    """Shade ``mesh`` smooth, optionally with per-corner custom normals.
+
+    This replaces ``bpy.ops.object.shade_smooth`` and works without a
+    selection or UI context.
+    """
+
+    mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+    if loop_normals is not None:
+        if hasattr(mesh, "use_auto_smooth"):  # Required for custom normals before Blender 4.1
+            mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set(np.asarray(loop_normals, dtype=np.float32).reshape(-1, 3))
+    mesh.update()
+
+
+def save_meshes(path: str, names, meshes) -> None:
+    """Store several meshes in one ``.npz`` file, concatenated with offsets.
+
+    UVs are stored for the meshes that have them; ``has_uvs`` records which.
+    """
+
+    meshes = list(meshes)
+    has_uvs = np.array([m.uvs is not None for m in meshes], dtype=bool)
+    arrays = {
+        "names": np.array([str(n) for n in names]),
+        "vertex_counts": np.array([m.num_vertices for m in meshes], dtype=np.int64),
+        "face_counts": np.array([m.num_faces for m in meshes], dtype=np.int64),
+        "loop_counts": np.array([m.num_loops for m in meshes], dtype=np.int64),
+        "has_uvs": has_uvs,
+    }
+    for field in ("vertices", "face_sizes", "face_vertices", "material_indices"):
+        parts = [getattr(m, field) for m in meshes]
+        arrays[field] = np.concatenate(parts) if parts else np.zeros(0)
+    uvs = [m.uvs for m in meshes if m.uvs is not None]
+    arrays["uvs"] = np.concatenate(uvs) if uvs else np.zeros((0, 2), dtype=np.float32)
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+
+def load_meshes(path: str) -> dict:
+    """Return the meshes stored by :func:`save_meshes`, keyed by name."""
+
+    with np.load(path) as f:
+        arrays = {key: f[key] for key in f.files}
+    vertex_ends = np.cumsum(arrays["vertex_counts"])
+    face_ends = np.cumsum(arrays["face_counts"])
+    loop_ends = np.cumsum(arrays["loop_counts"])
+    # Files written before ``has_uvs`` hold UVs for every mesh or for none.
+    has_uvs = arrays.get("has_uvs", np.full(len(arrays["names"]), "uvs" in arrays))
+    uv_ends = np.cumsum(arrays["loop_counts"] * has_uvs)
+    meshes = {}
+    for i, name in enumerate(arrays["names"]):
+        v0, v1 = vertex_ends[i] - arrays["vertex_counts"][i], vertex_ends[i]
+        f0, f1 = face_ends[i] - arrays["face_counts"][i], face_ends[i]
+        l0, l1 = loop_ends[i] - arrays["loop_counts"][i], loop_ends[i]
+        meshes[str(name)] = MeshData(
+            arrays["vertices"][v0:v1],
+            arrays["face_sizes"][f0:f1],
+            arrays["face_vertices"][l0:l1],
+            arrays["material_indices"][f0:f1],
+            arrays["uvs"][uv_ends[i] - (l1 - l0):uv_ends[i]] if has_uvs[i] else None,
+        )
+    return meshes
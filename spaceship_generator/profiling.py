@@ -0,0 +1,104 @@
+"""Optional memory instrumentation for spaceship generation.
+
+A :class:`MemoryProfiler` passed to ``generate_spaceship`` or
+``generate_movie`` records one structured record per stage boundary.
+When no profiler is passed nothing here runs.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+
+try:  # pragma: no cover - Blender specific
+    import bpy  # type: ignore
+except Exception:  # pragma: no cover
+    bpy = None  # type: ignore
+
+
+class MemoryProfiler:
+    """Collect peak allocation and element counts at each stage boundary.
+
+    Each record is a plain ``dict`` so fleet jobs can serialise and
+    aggregate them. Records are kept in :attr:`records` and also passed to
+    ``sink`` if given, e.g. ``JsonLinesSink("memory.jsonl")``.
+
+    Use it as a context manager, or call :meth:`start` and :meth:`stop`,
+    so the first stage's peak is measured from the start of generation.
+    """
+
+    def __init__(self, sink: Optional[Callable[[dict], None]] = None, **context):
+        self.sink = sink
+        self.context = context
+        self.records: List[dict] = []
+        self._started_tracing = False
+        self._active = False
+
+    def start(self) -> None:
+        self._active = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._reset_peak()
+
+    def stop(self) -> None:
+        self._active = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> "MemoryProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _reset_peak(self) -> None:
+        reset_peak = getattr(tracemalloc, "reset_peak", None)  # Python 3.9+
+        if reset_peak is not None:
+            reset_peak()
+
+    def record(self, stage: str, bm=None, **extra) -> dict:
+        """Record the state at the end of ``stage`` and reset the peak.
+
+        Raises ``RuntimeError`` if the profiler has not been started.
+        """
+
+        if not self._active or not tracemalloc.is_tracing():
+            raise RuntimeError("MemoryProfiler is not running, use it as a context manager")
+        current, peak = tracemalloc.get_traced_memory()
+        record = dict(self.context)
+        record.update(
+            stage=stage,
+            time=time.time(),
+            current_bytes=current,
+            peak_bytes=peak,
+        )
+        if bm is not None:
+            record.update(verts=len(bm.verts), edges=len(bm.edges), faces=len(bm.faces))
+        if bpy is not None and hasattr(bpy, "data"):  # pragma: no cover - Blender specific
+            record.update(
+                meshes=len(bpy.data.meshes),
+                materials=len(bpy.data.materials),
+                images=len(bpy.data.images),
+            )
+        record.update(extra)
+        self.records.append(record)
+        if self.sink is not None:
+            self.sink(record)
+        self._reset_peak()
+        return record
+
+
+class JsonLinesSink:
+    """Append each record to ``path`` as one line of JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __call__(self, record: dict) -> None:
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
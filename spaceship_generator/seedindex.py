@@ -0,0 +1,128 @@
+"""Searchable per-seed descriptors.
+
+Finding "long, narrow ships with two or more engines and no weapons"
+used to mean generating seeds until one fit. :func:`build_seed_index`
+records a few descriptors of every seed in a range once, and
+:class:`SeedIndex` answers range queries over them with NumPy::
+
+    index = SeedIndex.load("seeds.npz")
+    index.query(slenderness=(3, None), engines=(2, None), weapons=(0, 0))
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - NumPy ships with Blender
+    np = None  # type: ignore
+
+FLOAT_FIELDS = ("extent_x", "extent_y", "extent_z", "slenderness")
+COUNT_FIELDS = (
+    "num_vertices",
+    "num_faces",
+    "engines",
+    "grids",
+    "antennas",
+    "weapons",
+    "spheres",
+    "discs",
+    "cylinders",
+)
+FIELDS = FLOAT_FIELDS + COUNT_FIELDS
+
+
+def describe_seed(random_seed: str, params: Optional[dict] = None) -> dict:
+    """Run the generator for ``random_seed`` only as far as its descriptors need.
+
+    The generator is closed at its ``"descriptors"`` stage, before any
+    Blender mesh or object is created.
+    """
+
+    from .generator import iter_generate_spaceship
+
+    descriptors = {}
+    steps = iter_generate_spaceship(random_seed, descriptors=descriptors, **(params or {}))
+    try:
+        for stage in steps:
+            if stage == "descriptors":
+                break
+    finally:
+        steps.close()
+    return descriptors
+
+
+class SeedIndex:
+    """Descriptors of many seeds stored column by column.
+
+    ``columns`` maps every name in :data:`FIELDS` to an array with one
+    entry per seed in ``seeds``.
+    """
+
+    def __init__(self, seeds, columns: Dict[str, object]):
+        self.seeds = np.asarray(seeds, dtype=np.int64)
+        self.columns = {}
+        for name in FIELDS:
+            dtype = np.float32 if name in FLOAT_FIELDS else np.int32
+            self.columns[name] = np.asarray(columns[name], dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    def mask(self, **constraints: Tuple[Optional[float], Optional[float]]):
+        """Return a boolean array selecting seeds within every constraint.
+
+        Each keyword names a column and gives an inclusive ``(min, max)``
+        range; either bound may be ``None``.
+        """
+
+        selected = np.ones(len(self.seeds), dtype=bool)
+        for name, (low, high) in constraints.items():
+            if name not in self.columns:
+                raise KeyError("unknown descriptor %r, expected one of %s" % (name, ", ".join(FIELDS)))
+            column = self.columns[name]
+            if low is not None:
+                selected &= column >= low
+            if high is not None:
+                selected &= column <= high
+        return selected
+
+    def query(self, **constraints: Tuple[Optional[float], Optional[float]]):
+        """Return the seeds matching ``constraints``, see :meth:`mask`."""
+
+        return self.seeds[self.mask(**constraints)]
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez_compressed(f, seeds=self.seeds, **self.columns)
+
+    @classmethod
+    def load(cls, path: str) -> "SeedIndex":
+        with np.load(path) as f:
+            return cls(f["seeds"], {name: f[name] for name in FIELDS})
+
+
+def build_seed_index(
+    seeds: Iterable[int],
+    params: Optional[dict] = None,
+    describe: Callable[[str, Optional[dict]], dict] = describe_seed,
+) -> SeedIndex:
+    """Describe every seed in ``seeds`` and return the index.
+
+    ``describe`` is called with the seed as a string and ``params``.
+    Detail counts are zero when ``create_face_detail`` is off.
+    ``slenderness`` is the hull's length, along X where its segments are
+    extruded, over the larger of its other two extents.
+    """
+
+    seeds = list(seeds)
+    columns = {name: [] for name in FIELDS}
+    for seed in seeds:
+        descriptors = describe(str(seed), params)
+        for name in FIELDS:
+            if name != "slenderness":
+                columns[name].append(descriptors.get(name, 0))
+        width = max(descriptors["extent_y"], descriptors["extent_z"])
+        columns["slenderness"].append(descriptors["extent_x"] / width if width else 0.0)
+    return SeedIndex(seeds, columns)
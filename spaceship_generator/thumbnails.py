@@ -0,0 +1,201 @@
+"""Silhouette thumbnails rasterized with NumPy.
+
+:func:`render_thumbnail` draws the polygons of a :class:`MeshData` with an
+orthographic camera, flat shading and one color per :class:`Material`,
+which is enough to tell ships apart at a glance without Cycles or EEVEE.
+:func:`contact_sheet` tiles many thumbnails into one image::
+
+    sheet = contact_sheet([thumbnail_seed(str(seed)) for seed in range(100)])
+    save_png("ships.png", sheet)
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - NumPy ships with Blender
+    np = None  # type: ignore
+
+from .materials import Material
+from .meshdata import MeshData
+from .utils import encode_png, remove_spaceship
+
+MATERIAL_COLORS = {
+    Material.hull: (0.55, 0.58, 0.62),
+    Material.hull_lights: (0.85, 0.8, 0.45),
+    Material.hull_dark: (0.2, 0.21, 0.24),
+    Material.exhaust_burn: (1.0, 0.45, 0.15),
+    Material.glow_disc: (0.4, 0.8, 1.0),
+}
+
+# Image right, image up and towards the camera, as indices into (x, y, z)
+# with signs.
+VIEWS = {
+    "top": ((0, 1.0), (1, 1.0), (2, 1.0)),
+    "side": ((0, 1.0), (2, 1.0), (1, -1.0)),
+    "front": ((1, -1.0), (2, 1.0), (0, 1.0)),
+}
+
+_LIGHT = np.array([0.3, 0.5, 0.81]) if np is not None else None
+
+
+def mirror(data: MeshData, x: bool = True, y: bool = False) -> MeshData:
+    """Return ``data`` with mirrored copies added, like the Mirror modifier.
+
+    The generator leaves symmetry to a modifier, so the base mesh is only
+    one half of the ship.
+    """
+
+    for axis, enabled in ((0, x), (1, y)):
+        if not enabled:
+            continue
+        flipped = data.vertices.copy()
+        flipped[:, axis] *= -1
+        # Reverse each polygon's winding so the copy faces outwards.
+        starts = np.repeat(data.face_starts, data.face_sizes)
+        ends = starts + np.repeat(data.face_sizes, data.face_sizes) - 1
+        reversed_loops = starts + ends - np.arange(data.num_loops)
+        data = MeshData(
+            np.concatenate([data.vertices, flipped]),
+            np.concatenate([data.face_sizes, data.face_sizes]),
+            np.concatenate([data.face_vertices, data.face_vertices[reversed_loops] + data.num_vertices]),
+            np.concatenate([data.material_indices, data.material_indices]),
+        )
+    return data
+
+
+def _triangles(data: MeshData):
+    """Fan-triangulate the polygons; return corner vertex indices and polygon of each triangle."""
+
+    tri_counts = np.maximum(data.face_sizes - 2, 0)
+    faces = np.repeat(np.arange(data.num_faces), tri_counts)
+    within = np.arange(len(faces)) - np.repeat(np.cumsum(tri_counts) - tri_counts, tri_counts)
+    first = data.face_starts[faces]
+    corners = np.stack([first, first + within + 1, first + within + 2], axis=1)
+    return data.face_vertices[corners], faces
+
+
+def render_thumbnail(
+    data: MeshData,
+    size: int = 128,
+    view: str = "side",
+    background: Sequence[float] = (0.05, 0.05, 0.07),
+    margin: int = 2,
+):
+    """Return a ``(size, size, 3)`` ``uint8`` image of ``data`` seen along ``view``.
+
+    ``view`` is one of ``"top"``, ``"side"`` or ``"front"``. The mesh is
+    scaled to fit, keeping its proportions.
+    """
+
+    (ui, us), (vi, vs), (di, ds) = VIEWS[view]
+    image = np.empty((size, size, 3), dtype=np.float32)
+    image[:] = background
+    triangles, tri_faces = _triangles(data)
+    if not len(triangles):
+        return np.rint(image * 255).astype(np.uint8)
+
+    # Project to pixel coordinates, rows counting down from the top.
+    verts = data.vertices.astype(np.float64)
+    u, v, depth = verts[:, ui] * us, verts[:, vi] * vs, verts[:, di] * ds
+    extent = max(u.max() - u.min(), v.max() - v.min(), 1e-9)
+    scale = (size - 2 * margin) / extent
+    px = (u - (u.max() + u.min()) / 2) * scale + size / 2
+    py = size / 2 - (v - (v.max() + v.min()) / 2) * scale
+
+    x0, x1, x2 = px[triangles].T
+    y0, y1, y2 = py[triangles].T
+    area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+    visible = np.abs(area) > 1e-12
+    xmin = np.clip(np.floor(np.minimum(np.minimum(x0, x1), x2) - 0.5), 0, size - 1).astype(np.int64)
+    xmax = np.clip(np.ceil(np.maximum(np.maximum(x0, x1), x2) - 0.5), 0, size - 1).astype(np.int64)
+    ymin = np.clip(np.floor(np.minimum(np.minimum(y0, y1), y2) - 0.5), 0, size - 1).astype(np.int64)
+    ymax = np.clip(np.ceil(np.maximum(np.maximum(y0, y1), y2) - 0.5), 0, size - 1).astype(np.int64)
+    widths = np.where(visible, xmax - xmin + 1, 0)
+    heights = np.where(visible, ymax - ymin + 1, 0)
+
+    # One candidate per pixel of each triangle's bounding box.
+    counts = widths * heights
+    tri = np.repeat(np.arange(len(triangles)), counts)
+    offset = np.arange(len(tri)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = xmin[tri] + offset % widths[tri]
+    cy = ymin[tri] + offset // widths[tri]
+    sx, sy = cx + 0.5, cy + 0.5
+    w0 = ((x1[tri] - sx) * (y2[tri] - sy) - (x2[tri] - sx) * (y1[tri] - sy)) / area[tri]
+    w1 = ((x2[tri] - sx) * (y0[tri] - sy) - (x0[tri] - sx) * (y2[tri] - sy)) / area[tri]
+    w2 = 1.0 - w0 - w1
+    inside = (w0 >= -1e-9) & (w1 >= -1e-9) & (w2 >= -1e-9)
+    tri, cx, cy = tri[inside], cx[inside], cy[inside]
+    d = depth[triangles[tri]]
+    z = w0[inside] * d[:, 0] + w1[inside] * d[:, 1] + w2[inside] * d[:, 2]
+
+    # Depth test: keep the nearest candidate of every pixel.
+    pixel = cy * size + cx
+    order = np.lexsort((-z, pixel))
+    pixel, first = np.unique(pixel[order], return_index=True)
+    faces = tri_faces[tri[order[first]]]
+
+    normals = data.face_normals()[faces].astype(np.float64)
+    light = np.empty(3)
+    light[[ui, vi, di]] = _LIGHT * (us, vs, ds)
+    shade = 0.35 + 0.65 * np.abs(normals @ light)
+    palette = np.array([MATERIAL_COLORS.get(m, MATERIAL_COLORS[Material.hull]) for m in Material])
+    materials = np.clip(data.material_indices[faces], 0, len(palette) - 1)
+    image.reshape(-1, 3)[pixel] = palette[materials] * shade[:, None]
+    return np.rint(np.clip(image, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+def contact_sheet(images: Sequence, columns: Optional[int] = None, padding: int = 2):
+    """Tile equally sized thumbnails into one image, row by row."""
+
+    images = [np.asarray(image) for image in images]
+    if columns is None:
+        columns = max(1, int(np.ceil(np.sqrt(len(images)))))
+    rows = max(1, -(-len(images) // columns))
+    height, width, channels = images[0].shape
+    sheet = np.zeros(
+        (rows * (height + padding) + padding, columns * (width + padding) + padding, channels),
+        dtype=np.uint8,
+    )
+    for i, image in enumerate(images):
+        top = padding + (i // columns) * (height + padding)
+        left = padding + (i % columns) * (width + padding)
+        sheet[top:top + height, left:left + width] = image
+    return sheet
+
+
+def save_png(path: str, image) -> None:
+    """Write an ``(height, width, channels)`` ``uint8`` image as a PNG file."""
+
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width, channels = image.shape
+    with open(path, "wb") as f:
+        f.write(encode_png(image.tobytes(), width, height, channels))
+
+
+def thumbnail_seed(
+    random_seed: str, params: Optional[dict] = None, size: int = 128, view: str = "side"
+):  # pragma: no cover - Blender specific
+    """Generate the ship for ``random_seed`` and return its thumbnail.
+
+    Materials and modifiers are skipped since only the base mesh is read;
+    material indices are stored on the polygons either way.
+    """
+
+    from .generator import generate_spaceship
+
+    params = dict(params or {})
+    params.update(apply_bevel_modifier=False, assign_materials=False, bake_uvs=False)
+    obj = generate_spaceship(random_seed, **params)
+    try:
+        data = MeshData.from_mesh(obj.data)
+    finally:
+        remove_spaceship(obj)
+    data = mirror(
+        data,
+        x=params.get("allow_horizontal_symmetry", True),
+        y=params.get("allow_vertical_symmetry", False),
+    )
+    return render_thumbnail(data, size, view)
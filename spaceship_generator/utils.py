@@ -6,13 +6,23 @@ environments where Blender's Python API (``bpy``) is unavailable.
 
 from __future__ import annotations
 
+import ast
 import os
+import struct
+import sys
+import zlib
+from typing import List
 
 try:  # pragma: no cover - Blender specific
     import bpy  # type: ignore
 except Exception:  # pragma: no cover - Blender not available
     bpy = None  # type: ignore
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - NumPy ships with Blender
+    np = None  # type: ignore
+
 DIR = os.path.dirname(os.path.abspath(__file__))
 
 
@@ -22,6 +32,130 @@ def resource_path(*path_components: str) -> str:
     return os.path.join(DIR, *path_components)
 
 
+def addon_version() -> str:
+    """Return the add-on's ``bl_info["version"]`` as a dotted string.
+
+    ``bl_info`` is parsed rather than imported because the add-on module
+    needs Blender. An installed wheel has no add-on module, so the version
+    of the installed distribution is used instead.
+    """
+
+    path = os.path.join(os.path.dirname(DIR), "__init__.py")
+    if os.path.exists(path):
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "bl_info" for t in node.targets):
+                return ".".join(str(part) for part in ast.literal_eval(node.value)["version"])
+
+    from importlib.metadata import version  # Python 3.8+
+
+    return version("SpaceshipGenerator")
+
+
+def script_args() -> List[str]:
+    """Return the command line arguments meant for a script.
+
+    When running inside Blender these are the arguments after ``--``.
+    """
+
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return sys.argv[1:]
+
+
+def encode_png(data: bytes, width: int, height: int, channels: int = 4, compress_level: int = 6) -> bytes:
+    """Return an 8-bit PNG file holding ``data``.
+
+    ``data`` stores ``channels`` bytes per pixel, rows from top to bottom.
+    """
+
+    color_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    stride = width * channels
+    raw = b"".join(b"\x00" + data[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(tag: bytes, body: bytes) -> bytes:
+        crc = zlib.crc32(tag + body) & 0xFFFFFFFF
+        return struct.pack(">I", len(body)) + tag + body + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw, compress_level))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _unfilter_row(filter_type: int, row: bytearray, prev: bytearray, bpp: int) -> None:
+    # Average and Paeth depend on the previous byte of the same row, so
+    # they are undone byte by byte.
+    if filter_type == 3:
+        for i in range(len(row)):
+            left = row[i - bpp] if i >= bpp else 0
+            row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xFF
+    elif filter_type == 4:
+        for i in range(len(row)):
+            a = row[i - bpp] if i >= bpp else 0
+            b = prev[i]
+            c = prev[i - bpp] if i >= bpp else 0
+            p = a + b - c
+            pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+            row[i] = (row[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+    else:
+        raise ValueError("unknown PNG filter type %d" % filter_type)
+
+
+def decode_png(data: bytes):
+    """Return the pixels of an 8-bit, non-interlaced PNG file.
+
+    The result is a ``(height, width, channels)`` ``uint8`` array with rows
+    from top to bottom. Gray, gray-alpha, RGB and RGBA images are supported.
+    """
+
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError("not a PNG file")
+    pos = 8
+    chunks = []
+    header = None
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos:pos + 4])
+        tag = data[pos + 4:pos + 8]
+        body = data[pos + 8:pos + 8 + length]
+        if tag == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif tag == b"IDAT":
+            chunks.append(body)
+        elif tag == b"IEND":
+            break
+        pos += 12 + length
+    width, height, bit_depth, color_type, _, _, interlace = header
+    channels = {0: 1, 4: 2, 2: 3, 6: 4}.get(color_type)
+    if bit_depth != 8 or channels is None or interlace:
+        raise ValueError(
+            "unsupported PNG: bit depth %d, color type %d, interlace %d" % (bit_depth, color_type, interlace)
+        )
+
+    stride = width * channels
+    raw = np.frombuffer(zlib.decompress(b"".join(chunks)), dtype=np.uint8).reshape(height, stride + 1)
+    filters = raw[:, 0]
+    pixels = raw[:, 1:].copy()
+    prev = np.zeros(stride, dtype=np.uint8)
+    for y in range(height):
+        row = pixels[y]
+        if filters[y] == 1:
+            # Sub: a running sum along each channel.
+            row[:] = np.cumsum(row.reshape(width, channels), axis=0, dtype=np.uint8).reshape(-1)
+        elif filters[y] == 2:
+            row += prev
+        elif filters[y]:
+            unfiltered = bytearray(row.tobytes())
+            _unfilter_row(int(filters[y]), unfiltered, bytearray(prev.tobytes()), channels)
+            row[:] = np.frombuffer(bytes(unfiltered), dtype=np.uint8)
+        prev = row
+    return pixels.reshape(height, width, channels)
+
+
 def reset_scene() -> None:
     """Remove generated ships and unused materials from the scene.
 
@@ -44,3 +178,17 @@ def reset_scene() -> None:
         if not texture.users:
             bpy.data.textures.remove(texture)
 
+
+def remove_spaceship(obj) -> None:  # pragma: no cover - Blender specific
+    """Delete a generated ship along with its mesh, materials and child objects."""
+
+    for child in list(obj.children):
+        remove_spaceship(child)
+    mesh = obj.data
+    materials = [m for m in mesh.materials if m is not None]
+    bpy.data.objects.remove(obj)
+    if not mesh.users:
+        bpy.data.meshes.remove(mesh)
+    for material in materials:
+        if not material.users:
+            bpy.data.materials.remove(material)
@@ -16,6 +16,7 @@ stub_bpy.props = _stub("bpy.props")
 stub_bpy.props.StringProperty = lambda *a, **k: None
 stub_bpy.props.BoolProperty = lambda *a, **k: None
 stub_bpy.props.IntProperty = lambda *a, **k: None
+stub_bpy.props.FloatProperty = lambda *a, **k: None
 sys.modules.setdefault("bpy", stub_bpy)
 sys.modules.setdefault("bmesh", _stub("bmesh"))
 
@@ -67,6 +68,9 @@ class Matrix:
     def to_4x4(self):
         return self
 
+    def copy(self):
+        return Matrix(self.rows)
+
     @staticmethod
     def Rotation(angle, size, axis):  # pragma: no cover - used in stubs
         return Matrix.identity()
@@ -0,0 +1,87 @@
+"""Tests for the PNG decoder and the hull texture atlas."""
+
+import os
+import struct
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spaceship_generator import atlas  # noqa: E402
+from spaceship_generator.utils import decode_png, encode_png  # noqa: E402
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    return a if pa <= pb and pa <= pc else b if pb <= pc else c
+
+
+def _encode_filtered(image):
+    """Encode with every row using the next of the five PNG filters."""
+
+    height, width, channels = image.shape
+    rows = image.reshape(height, -1).astype(int)
+    raw = b""
+    for y in range(height):
+        filter_type = y % 5
+        row, prev = rows[y], rows[y - 1] if y else np.zeros_like(rows[y])
+        out = []
+        for i in range(len(row)):
+            a = row[i - channels] if i >= channels else 0
+            c = prev[i - channels] if i >= channels else 0
+            predictor = [0, a, prev[i], (a + prev[i]) // 2, _paeth(a, prev[i], c)][filter_type]
+            out.append((row[i] - predictor) & 0xFF)
+        raw += bytes([filter_type] + out)
+
+    def chunk(tag, body):
+        return struct.pack(">I", len(body)) + tag + body + struct.pack(">I", zlib.crc32(tag + body) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, {3: 2, 4: 6}[channels], 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def test_decode_png_round_trip():
+    image = np.random.default_rng(0).integers(0, 256, (7, 5, 4), dtype=np.uint8)
+    assert (decode_png(encode_png(image.tobytes(), 5, 7, 4)) == image).all()
+
+
+def test_decode_png_undoes_every_filter():
+    image = np.random.default_rng(1).integers(0, 256, (10, 6, 3), dtype=np.uint8)
+    assert (decode_png(_encode_filtered(image)) == image).all()
+
+
+def test_pack_atlas_channels():
+    normal = np.full((2, 2, 3), (128, 64, 255), dtype=np.uint8)
+    diffuse = np.full((2, 2, 4), (255, 255, 255, 10), dtype=np.uint8)
+    emit = np.full((2, 2, 3), 40, dtype=np.uint8)
+    packed = atlas.pack_atlas(normal, diffuse, emit)
+
+    assert packed.shape == (2, 2, 4)
+    assert tuple(packed[0, 0]) == (128, 64, 255, 40)
+    with pytest.raises(ValueError):
+        atlas.pack_atlas(normal, diffuse[:1], emit)
+
+
+def _write_texture(path, image):
+    height, width, channels = image.shape
+    path.write_bytes(encode_png(image.tobytes(), width, height, channels))
+
+
+def test_ensure_atlas_rebuilds_when_stale(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        atlas.ensure_atlas(str(tmp_path))
+
+    for name, value in ((atlas.NORMAL_TEXTURE, 128), (atlas.DIFFUSE_TEXTURE, 200), (atlas.EMIT_TEXTURE, 30)):
+        _write_texture(tmp_path / name, np.full((4, 4, 3), value, dtype=np.uint8))
+    path = atlas.ensure_atlas(str(tmp_path))
+    assert not atlas.atlas_is_stale(str(tmp_path))
+    assert tuple(decode_png(open(path, "rb").read())[0, 0]) == (128, 128, 200, 30)
+
+    emit = tmp_path / atlas.EMIT_TEXTURE
+    _write_texture(emit, np.full((4, 4, 3), 90, dtype=np.uint8))
+    os.utime(emit, (os.path.getmtime(path) + 10,) * 2)
+    assert atlas.atlas_is_stale(str(tmp_path))
+    atlas.ensure_atlas(str(tmp_path))
+    assert decode_png(open(path, "rb").read())[0, 0, 3] == 90
@@ -0,0 +1,70 @@
+"""Tests for convex collision proxies."""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spaceship_generator.collision import collision_hulls, convex_hull, symmetric_copies  # noqa: E402
+
+
+def _assert_convex_hull_of(hull, points):
+    assert (hull.face_sizes == 3).all()
+    normals = hull.face_normals().astype(np.float64)
+    corners = hull.vertices[hull.face_vertices[::3]].astype(np.float64)
+    offsets = np.einsum("ij,ij->i", normals, corners)
+    # Every point is on or behind every face, so faces point outwards.
+    assert (np.asarray(points) @ normals.T - offsets <= 1e-5).all()
+    # Closed surface: every edge is shared by exactly two faces.
+    tris = hull.face_vertices.reshape(-1, 3)
+    edges = np.sort(tris[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    assert (counts == 2).all()
+
+
+def test_convex_hull_of_random_points():
+    points = np.random.default_rng(1).normal(size=(2000, 3))
+    hull = convex_hull(points)
+    _assert_convex_hull_of(hull, points)
+    assert hull.num_vertices < 200
+
+
+def test_convex_hull_of_points_on_a_sphere_is_fast():
+    # Every point is a hull vertex, the worst case for quickhull.
+    points = np.random.default_rng(2).normal(size=(3000, 3))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    start = time.perf_counter()
+    hull = convex_hull(points)
+    elapsed = time.perf_counter() - start
+
+    _assert_convex_hull_of(hull, points)
+    assert hull.num_vertices == 3000
+    # Generous bound; retesting every point against every face took minutes.
+    assert elapsed < 15
+
+
+def test_convex_hull_of_cube_drops_interior_and_coplanar_points():
+    corners = np.array([(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=float)
+    points = np.concatenate([corners, [(0, 0, 0), (0.5, 0.2, -0.1), (1, 0, 0), (0, 1, 1)]])
+    hull = convex_hull(points)
+
+    _assert_convex_hull_of(hull, points)
+    assert hull.num_vertices == 8
+    assert hull.num_faces == 12
+
+
+def test_convex_hull_rejects_flat_points():
+    with pytest.raises(ValueError):
+        convex_hull([(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)])
+
+
+def test_collision_hulls_mirror_segments():
+    segment = [(x, y, z) for x in (1, 2) for y in (0, 1) for z in (0, 1)]
+    flat = [(3, 0, 0), (3, 1, 0), (4, 0, 0), (4, 1, 0)]
+    hulls = collision_hulls(segment, [segment, flat], x=True)
+
+    assert len(hulls) == 3
+    assert np.allclose(hulls[0].vertices[:, 0].min(), -2)
+    assert hulls[2].vertices[:, 0].max() == -1
+    assert len(symmetric_copies(segment, x=True, y=True)) == 4
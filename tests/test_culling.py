@@ -0,0 +1,28 @@
+"""Tests for hidden greeble culling that do not require Blender."""
+
+from spaceship_generator.culling import greeble_is_hidden, mirrored_points
+
+
+def _inside_box(point):
+    # A hull occupying 1 < x < 3 only, so its mirror occupies -3 < x < -1.
+    x, y, z = point
+    return 1 < x < 3 and -1 < y < 1 and -1 < z < 1
+
+
+def test_mirrored_points():
+    assert mirrored_points((1, 2, 3)) == [(1, 2, 3), (-1, 2, 3)]
+    assert len(mirrored_points((1, 2, 3), x=True, y=True)) == 4
+    assert mirrored_points((1, 2, 3), x=False) == [(1, 2, 3)]
+
+
+def test_greeble_is_hidden_needs_every_point_inside():
+    buried = [(2, 0, 0), (2.5, 0.5, 0.5)]
+    poking_out = [(2, 0, 0), (2, 0, 1.5)]
+    assert greeble_is_hidden(buried, _inside_box)
+    assert not greeble_is_hidden(poking_out, _inside_box)
+
+
+def test_greeble_is_hidden_inside_mirrored_half():
+    greeble = [(-2, 0, 0), (-1.5, 0.2, 0)]
+    assert greeble_is_hidden(greeble, _inside_box, x=True)
+    assert not greeble_is_hidden(greeble, _inside_box, x=False)
@@ -0,0 +1,92 @@
+"""Tests for geometry fingerprints."""
+
+import json
+import pathlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spaceship_generator import fingerprint as fp
+from spaceship_generator.meshdata import MeshData
+
+CORPUS = pathlib.Path(__file__).parent / "golden" / "fingerprints.json"
+
+
+def _quad(offset=0.0, material=0):
+    vertices = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, offset)]
+    return MeshData(vertices, [4], [0, 1, 2, 3], [material])
+
+
+def test_fingerprint_is_stable():
+    assert fp.fingerprint(_quad()) == fp.fingerprint(_quad())
+
+
+def test_fingerprint_ignores_float_noise():
+    assert fp.fingerprint(_quad()) == fp.fingerprint(_quad(offset=1e-7))
+
+
+def test_fingerprint_detects_changes():
+    base = fp.fingerprint(_quad())
+    assert fp.fingerprint(_quad(offset=0.01)) != base
+    assert fp.fingerprint(_quad(material=1)) != base
+    flipped = MeshData(_quad().vertices, [4], [3, 2, 1, 0])
+    assert fp.fingerprint(flipped) != base
+
+
+def _write_corpus(path, fingerprints):
+    cases = [{"seed": str(i), "params": {}, "fingerprint": f} for i, f in enumerate(fingerprints)]
+    path.write_text(json.dumps({"precision": 0.001, "cases": cases}))
+
+
+def test_check_corpus_fails_unrecorded_cases(tmp_path):
+    path = tmp_path / "corpus.json"
+    _write_corpus(path, ["fp-0", None, "stale"])
+    generated = []
+
+    def fingerprint_case(seed, params, precision):
+        generated.append(seed)
+        return "fp-" + seed
+
+    failures = fp.check_corpus(str(path), fingerprint_case=fingerprint_case)
+
+    assert generated == ["0", "2"]
+    assert len(failures) == 2
+    assert "'1'" in failures[0] and "no fingerprint" in failures[0]
+    assert "'2'" in failures[1] and "expected stale" in failures[1]
+    assert [c["seed"] for c in fp.unrecorded_cases(json.loads(path.read_text()))] == ["1"]
+
+
+def test_golden_corpus_is_fully_recorded():
+    corpus = json.loads(CORPUS.read_text())
+
+    assert corpus["cases"] and fp.unrecorded_cases(corpus) == []
+
+
+def test_check_corpus_update_records_every_case(tmp_path):
+    path = tmp_path / "corpus.json"
+    _write_corpus(path, ["fp-0", None])
+
+    assert fp.check_corpus(str(path), update=True, fingerprint_case=lambda seed, params, precision: "new") == []
+
+    corpus = json.loads(path.read_text())
+    assert [c["fingerprint"] for c in corpus["cases"]] == ["new", "new"]
+    assert fp.unrecorded_cases(corpus) == []
+
+
+def test_golden_corpus():
+    import bmesh
+
+    if not hasattr(bmesh, "new"):
+        pytest.skip("regenerating ships requires Blender")
+    failures = fp.check_corpus(str(CORPUS))
+    assert not failures, "\n".join(failures)
+
+
+def test_fingerprint_ignores_element_order():
+    vertices = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0)]
+    data = MeshData(vertices, [4, 3], [0, 1, 2, 3, 1, 4, 2], [0, 1])
+    reordered = MeshData(
+        [vertices[i] for i in (4, 2, 0, 3, 1)], [3, 4], [4, 0, 1, 4, 1, 3, 2], [1, 0]
+    )
+    assert fp.fingerprint(reordered) == fp.fingerprint(data)
@@ -0,0 +1,177 @@
+"""Tests for fleet scheduling that do not require Blender."""
+
+import pytest
+
+from spaceship_generator import fleet
+
+
+def test_estimate_hull_faces_is_deterministic():
+    assert fleet.estimate_hull_faces("42") == fleet.estimate_hull_faces("42")
+
+
+def test_estimate_hull_faces_without_segments_is_cube():
+    assert fleet.estimate_hull_faces("42", 0, 0) == 6
+
+
+def test_estimate_hull_faces_grows_with_segments():
+    small = sum(fleet.estimate_hull_faces(str(i), 1, 1) for i in range(20))
+    large = sum(fleet.estimate_hull_faces(str(i), 12, 12) for i in range(20))
+    assert large > small
+
+
+def test_cost_model_fit_matches_history(tmp_path):
+    model = fleet.CostModel()
+    seeds = [str(i) for i in range(20)]
+    for s in seeds:
+        model.observe(s, None, 0.5 + 0.01 * model.estimate_units(s))
+    # Re-observing a seed replaces its sample instead of adding another.
+    model.observe(seeds[0], None, 0.5 + 0.01 * model.estimate_units(seeds[0]))
+
+    assert model.seconds_per_face == pytest.approx(0.01)
+    assert model.overhead == pytest.approx(0.5)
+
+    path = str(tmp_path / "costs.json")
+    model.save(path)
+    loaded = fleet.CostModel.load(path)
+    loaded.observe("new", None, 0.5 + 0.01 * loaded.estimate_units("new"))
+    assert loaded.seconds_per_face == pytest.approx(0.01)
+
+
+def test_run_fleet_dispatches_most_expensive_first():
+    calls = []
+    model = fleet.CostModel()
+    seeds = [str(i) for i in range(10)]
+    report = fleet.run_fleet(seeds, lambda s, p: calls.append(s), max_workers=1, cost_model=model)
+
+    predicted = [r.predicted for r in report.results]
+    assert predicted == sorted(predicted, reverse=True)
+    assert calls == [r.random_seed for r in report.results]
+    assert model.predict(calls[0]) == report.results[0].actual
+
+
+class FakeObject:
+    def __init__(self, name, children=()):
+        self.name = name
+        self.parent = None
+        self.children = list(children)
+        for child in self.children:
+            child.parent = self
+
+    def copy(self):
+        duplicate = FakeObject(self.name)
+        duplicate.parent = self.parent
+        return duplicate
+
+
+class FakeCollection:
+    def __init__(self):
+        self.objects = self
+        self.linked = []
+
+    def link(self, obj):
+        self.linked.append(obj)
+
+
+def test_linked_duplicate_keeps_collision_proxies():
+    proxies = [FakeObject("Spaceship Collision"), FakeObject("Spaceship Collision Segment")]
+    ship = FakeObject("Spaceship", proxies)
+    collection = FakeCollection()
+
+    duplicate = fleet.linked_duplicate(ship, collection)
+
+    assert [obj.name for obj in collection.linked] == ["Spaceship", "Spaceship Collision", "Spaceship Collision Segment"]
+    assert collection.linked[0] is duplicate
+    assert all(obj.parent is duplicate for obj in collection.linked[1:])
+    assert all(proxy.parent is ship for proxy in proxies)
+
+
+def _fake_generate(calls):
+    from spaceship_generator.meshdata import MeshData
+
+    def generate(random_seed, params):
+        calls.append(random_seed)
+        n = int(random_seed)
+        return MeshData([(n, 0, 0), (0, 1, 0), (0, 0, 1)], [3], [0, 1, 2])
+
+    return generate
+
+
+def test_build_shards_skips_completed_shards(tmp_path):
+    pytest.importorskip("numpy")
+    calls = []
+    out_dir = str(tmp_path)
+
+    built = fleet.build_shards(out_dir, 0, 25, 10, {"create_face_detail": False}, generate=_fake_generate(calls))
+    assert [s.seed_stop for s in built] == [10, 20, 25]
+    assert len(calls) == 25
+
+    (tmp_path / "shard_00001.npz").write_bytes(b"corrupt")
+    built = fleet.build_shards(out_dir, 0, 25, 10, {"create_face_detail": False}, generate=_fake_generate(calls))
+    assert [s.index for s in built] == [1]
+    assert len(calls) == 35
+
+
+def test_build_shards_splits_work_between_machines(tmp_path):
+    pytest.importorskip("numpy")
+    calls = []
+    built = fleet.build_shards(
+        str(tmp_path), 0, 40, 10, machine_index=1, machine_count=2, generate=_fake_generate(calls)
+    )
+    assert [s.index for s in built] == [1, 3]
+
+
+def test_merge_shards(tmp_path):
+    pytest.importorskip("numpy")
+    from spaceship_generator.meshdata import load_meshes
+
+    fleet.build_shards(str(tmp_path), 0, 25, 10, generate=_fake_generate([]))
+    index = fleet.merge_shards(str(tmp_path))
+
+    assert (index["seed_start"], index["seed_stop"]) == (0, 25)
+    assert len(index["shards"]) == 3
+    meshes = load_meshes(str(tmp_path / "shard_00002.npz"))
+    assert sorted(meshes) == ["20", "21", "22", "23", "24"]
+    assert meshes["23"].vertices[0][0] == 23
+
+    (tmp_path / "shard_00001.json").unlink()
+    with pytest.raises(ValueError):
+        fleet.merge_shards(str(tmp_path))
+
+
+def test_merge_shards_verifies_checksums(tmp_path):
+    pytest.importorskip("numpy")
+    fleet.build_shards(str(tmp_path), 0, 20, 10, generate=_fake_generate([]))
+
+    (tmp_path / "shard_00001.npz").write_bytes(b"corrupt")
+    with pytest.raises(ValueError, match="shard_00001.npz"):
+        fleet.merge_shards(str(tmp_path))
+
+    (tmp_path / "shard_00001.npz").unlink()
+    with pytest.raises(ValueError, match="shard_00001.npz"):
+        fleet.merge_shards(str(tmp_path))
+    assert not (tmp_path / "index.json").exists()
+
+
+def test_version_comes_from_bl_info():
+    import ast
+    import pathlib
+
+    from spaceship_generator import __version__
+
+    source = (pathlib.Path(__file__).resolve().parent.parent / "__init__.py").read_text()
+    bl_info = next(
+        ast.literal_eval(node.value)
+        for node in ast.parse(source).body
+        if isinstance(node, ast.Assign) and node.targets[0].id == "bl_info"
+    )
+    assert __version__ == ".".join(map(str, bl_info["version"]))
+
+
+def test_cli_parse_params():
+    from spaceship_generator.cli import parse_params
+
+    assert parse_params(["num_hull_segments_max=10", "create_face_detail=false", "name=abc"]) == {
+        "num_hull_segments_max": 10,
+        "create_face_detail": False,
+        "name": "abc",
+    }
@@ -0,0 +1,153 @@
+"""Tests for background frame writing."""
+
+import struct
+import sys
+import types
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spaceship_generator.frames import FrameWriter, float_to_srgb8, standard_view_transform, viewer_node
+from spaceship_generator.utils import encode_png
+
+
+def _decode_png(png):
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height = struct.unpack(">II", png[16:24])
+    idat_length = struct.unpack(">I", png[33:37])[0]
+    raw = zlib.decompress(png[41:41 + idat_length])
+    return width, height, raw
+
+
+def test_encode_png_round_trip():
+    data = bytes(range(2 * 3 * 4))
+    width, height, raw = _decode_png(encode_png(data, 2, 3))
+
+    assert (width, height) == (2, 3)
+    assert raw == b"".join(b"\x00" + data[y * 8:(y + 1) * 8] for y in range(3))
+
+
+def test_float_to_srgb8_flips_rows_and_applies_transfer():
+    pixels = np.array([[0.0, 0.0, 0.0, 1.0], [1.0, 0.22, 1.0, 0.5]], dtype=np.float32)
+    data = float_to_srgb8(pixels.ravel(), 1, 2)
+
+    assert list(data[:4]) == [255, 129, 255, 128]
+    assert list(data[4:]) == [0, 0, 0, 255]
+
+
+def test_frame_writer_writes_pngs(tmp_path):
+    pixels = np.ones(4 * 4 * 4, dtype=np.float32)
+    with FrameWriter(max_workers=2, max_pending=2) as writer:
+        for frame in range(5):
+            writer.submit(str(tmp_path / "out" / ("%d.png" % frame)), pixels, 4, 4)
+
+    for frame in range(5):
+        width, height, raw = _decode_png((tmp_path / "out" / ("%d.png" % frame)).read_bytes())
+        assert (width, height) == (4, 4)
+        assert set(raw) == {0, 255}
+
+
+def test_frame_writer_pipes_frames_in_order(tmp_path):
+    target = tmp_path / "frames.raw"
+    command = [sys.executable, "-c", "import sys; open(%r, 'wb').write(sys.stdin.buffer.read())" % str(target)]
+    with FrameWriter(pipe_command=command) as writer:
+        for value in (0.0, 1.0, 0.0):
+            writer.submit("unused.png", np.full(4, value, dtype=np.float32), 1, 1)
+
+    assert list(target.read_bytes()) == [0, 0, 0, 0, 255, 255, 255, 255, 0, 0, 0, 0]
+
+
+class FakeSocket:
+    def __init__(self, node):
+        self.node = node
+        self.links = []
+
+
+class FakeNode:
+    def __init__(self, node_type):
+        self.type = node_type
+        self.inputs = {"Image": FakeSocket(self)}
+        self.outputs = {"Image": FakeSocket(self)}
+
+
+class FakeNodes(list):
+    def new(self, kind):
+        self.append(FakeNode({"CompositorNodeRLayers": "R_LAYERS", "CompositorNodeViewer": "VIEWER"}[kind]))
+        return self[-1]
+
+    def remove(self, node):
+        # Like Blender, removing a node also removes its links.
+        for link in [link for socket in (*node.inputs.values(), *node.outputs.values()) for link in socket.links]:
+            self.links.remove(link)
+        list.remove(self, node)
+
+
+class FakeLinks(list):
+    def new(self, from_socket, to_socket):
+        for link in list(to_socket.links):
+            self.remove(link)
+        link = types.SimpleNamespace(from_socket=from_socket, to_socket=to_socket)
+        from_socket.links.append(link)
+        to_socket.links.append(link)
+        self.append(link)
+        return link
+
+    def remove(self, link):
+        link.from_socket.links.remove(link)
+        link.to_socket.links.remove(link)
+        list.remove(self, link)
+
+
+def _scene(*node_types):
+    tree = types.SimpleNamespace(nodes=FakeNodes(FakeNode(t) for t in node_types), links=FakeLinks())
+    tree.nodes.links = tree.links
+    return types.SimpleNamespace(use_nodes=False, node_tree=tree)
+
+
+def test_viewer_node_removes_what_it_added():
+    scene = _scene("R_LAYERS")
+    with pytest.raises(RuntimeError):
+        with viewer_node(scene) as viewer:
+            assert scene.use_nodes and viewer in scene.node_tree.nodes
+            assert viewer.inputs["Image"].links[0].from_socket.node.type == "R_LAYERS"
+            raise RuntimeError("render failed")
+
+    assert not scene.use_nodes
+    assert [n.type for n in scene.node_tree.nodes] == ["R_LAYERS"] and scene.node_tree.links == []
+
+
+def test_viewer_node_restores_an_existing_link():
+    scene = _scene("R_LAYERS", "VIEWER", "BLUR")
+    scene.use_nodes = True
+    layers, viewer, blur = scene.node_tree.nodes
+    scene.node_tree.links.new(blur.outputs["Image"], viewer.inputs["Image"])
+
+    with viewer_node(scene):
+        assert viewer.inputs["Image"].links[0].from_socket is layers.outputs["Image"]
+
+    assert scene.use_nodes and len(scene.node_tree.nodes) == 3
+    assert [link.from_socket for link in scene.node_tree.links] == [blur.outputs["Image"]]
+
+
+def test_standard_view_transform_restores_color_management():
+    view = types.SimpleNamespace(
+        view_transform="Filmic", look="High Contrast", exposure=1.5, gamma=0.8, use_curve_mapping=True
+    )
+    scene = types.SimpleNamespace(
+        view_settings=view,
+        display_settings=types.SimpleNamespace(display_device="Display P3"),
+        render=types.SimpleNamespace(dither_intensity=1.0),
+    )
+    saved = dict(vars(view))
+
+    with pytest.raises(RuntimeError):
+        with standard_view_transform(scene):
+            assert (view.view_transform, view.look, view.exposure, view.gamma) == ("Standard", "None", 0.0, 1.0)
+            assert not view.use_curve_mapping and scene.render.dither_intensity == 0.0
+            assert scene.display_settings.display_device == "sRGB"
+            raise RuntimeError("render failed")
+
+    assert vars(view) == saved
+    assert scene.display_settings.display_device == "Display P3" and scene.render.dither_intensity == 1.0
@@ -1,6 +1,9 @@
 """Tests for generator utilities that do not require Blender."""
 
 import inspect
+import types
+
+import pytest
 
 
 def test_no_randrange_usage():
@@ -9,3 +12,263 @@ def test_no_randrange_usage():
     source = inspect.getsource(generator)
     assert "randrange" not in source
 
+
+class Vec:
+    def __init__(self, coords):
+        self.x, self.y, self.z = coords
+
+    def __neg__(self):
+        return Vec((-self.x, -self.y, -self.z))
+
+    def __mul__(self, scalar):
+        return Vec((self.x * scalar, self.y * scalar, self.z * scalar))
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def dot(self, other):
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+
+class FakeFace:
+    def __init__(self, normal):
+        self.normal = Vec(normal)
+        self.verts = [types.SimpleNamespace(co=self.normal * 0.5)]
+        self.material_index = 0
+        self.is_valid = True
+
+    def calc_center_bounds(self):
+        return self.normal
+
+
+class FakeBMesh:
+    def __init__(self):
+        self.faces = []
+        self.freed = False
+
+    @property
+    def verts(self):
+        return [v for face in self.faces for v in face.verts]
+
+    def to_mesh(self, mesh):
+        mesh.num_faces = len(self.faces)
+        mesh.slots_at_to_mesh = len(getattr(mesh, "materials", ()))
+
+    def free(self):
+        self.freed = True
+
+
+class FakeOps:
+    @staticmethod
+    def create_cube(bm, size):
+        for axis in range(3):
+            for sign in (1, -1):
+                normal = [0, 0, 0]
+                normal[axis] = sign
+                bm.faces.append(FakeFace(normal))
+
+    @staticmethod
+    def scale(bm, vec, verts):
+        pass
+
+    @staticmethod
+    def translate(bm, vec, verts):
+        pass
+
+    @staticmethod
+    def rotate(bm, verts, cent, matrix):
+        pass
+
+
+class FakeMaterials(list):
+    def clear(self):
+        del self[:]
+
+
+class FakeMesh(dict):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.materials = FakeMaterials()
+        self.uv_layers = []
+
+
+class FakeModifiers(dict):
+    def new(self, name, type):
+        self[name] = types.SimpleNamespace(use_axis=[False, False, False])
+        return self[name]
+
+    def remove(self, modifier):
+        del self[next(name for name, m in self.items() if m is modifier)]
+
+
+class FakeObject:
+    def __init__(self, name, mesh):
+        self.name = name
+        self.data = mesh
+        self.modifiers = FakeModifiers()
+        self.children = []
+
+    def select_set(self, state):
+        self.selected = state
+
+
+@pytest.fixture
+def fake_blender(monkeypatch):
+    from spaceship_generator import generator
+
+    blender = types.SimpleNamespace(bmeshes=[], meshes=[], objects=[], linked=[], details=[])
+
+    def new_bmesh():
+        blender.bmeshes.append(FakeBMesh())
+        return blender.bmeshes[-1]
+
+    def new_mesh(name):
+        blender.meshes.append(FakeMesh(name))
+        return blender.meshes[-1]
+
+    def new_object(name, mesh):
+        blender.objects.append(FakeObject(name, mesh))
+        return blender.objects[-1]
+
+    def add_detail(kind):
+        return lambda bm, face, **kwargs: blender.details.append(kind)
+
+    monkeypatch.setattr(generator, "bmesh", types.SimpleNamespace(new=new_bmesh, ops=FakeOps))
+    monkeypatch.setattr(generator, "bpy", types.SimpleNamespace(
+        data=types.SimpleNamespace(
+            meshes=types.SimpleNamespace(new=new_mesh),
+            objects=types.SimpleNamespace(new=new_object),
+        ),
+        context=types.SimpleNamespace(
+            collection=types.SimpleNamespace(objects=types.SimpleNamespace(link=blender.linked.append)),
+            view_layer=types.SimpleNamespace(objects=types.SimpleNamespace(active=None)),
+        ),
+    ))
+    monkeypatch.setattr(generator, "Vector", Vec)
+    monkeypatch.setattr(generator, "extrude_face", lambda bm, face, distance, *args: face)
+    monkeypatch.setattr(generator, "ribbed_extrude_face", lambda bm, face, *args: face)
+    monkeypatch.setattr(generator, "scale_face", lambda *args: None)
+    monkeypatch.setattr(generator, "get_aspect_ratio", lambda face: 1.0)
+    monkeypatch.setattr(generator, "is_rear_face", lambda face: face.normal.x < -0.9)
+    monkeypatch.setattr(generator, "write_normals", lambda *args: None)
+    for name in (
+        "add_exhaust_to_face",
+        "add_grid_to_face",
+        "add_surface_antenna_to_face",
+        "add_weapons_to_face",
+        "add_sphere_to_face",
+        "add_disc_to_face",
+        "add_cylinders_to_face",
+    ):
+        monkeypatch.setattr(generator, name, add_detail(name))
+    return blender
+
+
+def _run(steps):
+    stages = []
+    while True:
+        try:
+            stages.append(next(steps))
+        except StopIteration as done:
+            return stages, done.value
+
+
+def test_iter_generate_spaceship_runs_through_its_stages(fake_blender):
+    from spaceship_generator.generator import iter_generate_spaceship
+
+    stages, obj = _run(iter_generate_spaceship("4", bake_uvs=False, assign_materials=False))
+
+    assert [s for i, s in enumerate(stages) if i == 0 or stages[i - 1] != s] == ["hull", "asymmetry", "detail"]
+    assert fake_blender.details and "add_exhaust_to_face" in fake_blender.details
+    assert fake_blender.linked == [obj]
+    assert obj.data is fake_blender.meshes[0] and obj.data.num_faces == 6
+    assert sorted(obj.modifiers) == ["Bevel", "Mirror"]
+    assert fake_blender.bmeshes[0].freed
+
+
+def test_iter_generate_spaceship_close_frees_the_partial_mesh(fake_blender):
+    from spaceship_generator.generator import iter_generate_spaceship
+
+    steps = iter_generate_spaceship("3")
+    assert next(steps) == "hull"
+    steps.close()
+
+    assert fake_blender.bmeshes[0].freed
+    assert fake_blender.meshes == [] and fake_blender.objects == []
+
+
+def test_generate_spaceship_matches_iter_generate_spaceship(fake_blender):
+    from spaceship_generator import generator
+
+    assert inspect.signature(generator.generate_spaceship) == inspect.signature(generator.iter_generate_spaceship)
+    with pytest.raises(TypeError):
+        generator.generate_spaceship("3", num_hull_segment_max=4)
+    assert fake_blender.bmeshes == []
+
+    obj = generator.generate_spaceship("3", bake_uvs=False, assign_materials=False, apply_bevel_modifier=False)
+    assert sorted(obj.modifiers) == ["Mirror"]
+
+
+def test_describe_seed_stops_before_creating_datablocks(fake_blender):
+    from spaceship_generator.seedindex import describe_seed
+
+    descriptors = describe_seed("4")
+
+    assert descriptors["num_faces"] == 6 and descriptors["engines"] == 1
+    assert set(descriptors) >= {"extent_x", "extent_y", "extent_z", "num_vertices"}
+    assert fake_blender.meshes == [] and fake_blender.objects == [] and fake_blender.linked == []
+    assert [bm.freed for bm in fake_blender.bmeshes] == [True]
+
+
+def test_descriptors_stage_only_with_descriptors(fake_blender):
+    from spaceship_generator.generator import iter_generate_spaceship
+
+    stages, _ = _run(iter_generate_spaceship("4", bake_uvs=False, assign_materials=False))
+    assert "descriptors" not in stages
+
+    stages, _ = _run(iter_generate_spaceship("4", bake_uvs=False, assign_materials=False, descriptors={}))
+    assert stages[-1] == "descriptors"
+
+
+def test_collision_segments_imply_collision_proxies(fake_blender, monkeypatch):
+    from spaceship_generator import generator
+
+    added = []
+    monkeypatch.setattr(generator.MeshData, "from_mesh", classmethod(lambda cls, mesh: types.SimpleNamespace(vertices=[])))
+    monkeypatch.setattr(generator, "collision_hulls", lambda vertices, segments, x, y: ["ship"] + segments)
+    monkeypatch.setattr(generator, "add_collision_proxies", lambda obj, hulls: added.append((obj, hulls)))
+
+    obj = generator.generate_spaceship("4", bake_uvs=False, assign_materials=False, collision_segments=True)
+
+    assert len(added) == 1 and added[0][0] is obj
+    assert added[0][1][0] == "ship" and len(added[0][1]) > 1
+
+
+def test_reused_ship_replaces_materials_and_uvs_when_settings_change(fake_blender, monkeypatch):
+    from spaceship_generator import generator
+
+    removed, recolored = [], []
+    monkeypatch.setattr(generator.bpy.data, "materials", types.SimpleNamespace(remove=removed.append), raising=False)
+    monkeypatch.setattr(generator.MeshData, "from_mesh", classmethod(
+        lambda cls, mesh: types.SimpleNamespace(cube_project_uvs=lambda: None)
+    ))
+    monkeypatch.setattr(generator, "write_uvs", lambda mesh, uvs: mesh.uv_layers.append("UVMap"))
+    monkeypatch.setattr(generator, "create_materials", lambda use_uvs, use_atlas: [
+        types.SimpleNamespace(users=0, settings=(use_uvs, use_atlas)) for _ in generator.Material
+    ])
+    monkeypatch.setattr(generator, "update_hull_color", lambda materials, color: recolored.append(materials))
+
+    obj = generator.generate_spaceship("4", bake_uvs=True)
+    first = list(obj.data.materials)
+    assert obj.data.uv_layers == ["UVMap"]
+
+    generator.generate_spaceship("4", bake_uvs=True, reuse_object=obj)
+    assert recolored == [obj.data.materials] and obj.data.materials == first and removed == []
+
+    generator.generate_spaceship("4", bake_uvs=False, texture_atlas=True, reuse_object=obj)
+    # Clearing slots resets material indices, so it must precede to_mesh.
+    assert obj.data.slots_at_to_mesh == 0
+    assert removed == first and obj.data.uv_layers == []
+    assert {mat.settings for mat in obj.data.materials} == {(False, True)}
+    assert len(recolored) == 1 and fake_blender.meshes == [obj.data]
@@ -1,11 +1,17 @@
 """Tests for geometry utilities using stubbed Blender modules."""
 
+import random
+import types
+
+import pytest
+
 from spaceship_generator import geometry
 
 
 class Vert:
     def __init__(self, co):
         self.co = co
+        self.link_faces = []
 
 
 class Edge:
@@ -54,3 +60,306 @@ def test_get_aspect_ratio_invalid_face():
 
     assert geometry.get_aspect_ratio(face) == 1.0
 
+
+def test_get_aspect_ratio_is_cached_until_invalidated():
+    v0 = Vert(geometry.Vector((0, 0, 0)))
+    edges = [Edge(4.0), Edge(1.0)]
+    face = Face([v0, v0, v0, v0], edges, geometry.Vector((0, 0, 1)))
+    v0.link_faces.append(face)
+
+    with geometry.face_metrics_cache():
+        assert geometry.get_aspect_ratio(face) == 4.0
+        edges[0]._length = 2.0
+        assert geometry.get_aspect_ratio(face) == 4.0
+
+        geometry.invalidate_face_metrics([face])
+        assert geometry.get_aspect_ratio(face) == 2.0
+
+
+def test_invalidate_face_metrics_drops_neighbours():
+    shared = Vert(geometry.Vector((0, 0, 0)))
+    a = Face([shared] * 3, [Edge(3.0), Edge(1.0)], geometry.Vector((0, 0, 1)))
+    b = Face([shared] * 3, [Edge(1.0), Edge(1.0)], geometry.Vector((0, 0, 1)))
+    shared.link_faces += [a, b]
+    with geometry.face_metrics_cache():
+        geometry.get_aspect_ratio(a)
+        geometry.get_aspect_ratio(b)
+
+        geometry.invalidate_face_metrics([a])
+
+        assert b not in geometry._face_metrics
+
+
+def test_face_metrics_are_only_cached_inside_a_scope():
+    edges = [Edge(4.0), Edge(1.0)]
+    face = Face([Vert(geometry.Vector((0, 0, 0)))] * 4, edges, geometry.Vector((0, 0, 1)))
+
+    assert geometry.get_aspect_ratio(face) == 4.0
+    edges[0]._length = 2.0
+    assert geometry.get_aspect_ratio(face) == 2.0
+
+    with geometry.face_metrics_cache():
+        geometry.get_aspect_ratio(face)
+        assert face in geometry._face_metrics
+    assert geometry._face_metrics is None
+
+
+class MeshVector:
+    """Enough of ``mathutils.Vector`` to move vertices around."""
+
+    def __init__(self, coords):
+        self.x, self.y, self.z = (float(c) for c in coords)
+
+    def __add__(self, other):
+        return MeshVector((self.x + other.x, self.y + other.y, self.z + other.z))
+
+    def __sub__(self, other):
+        return MeshVector((self.x - other.x, self.y - other.y, self.z - other.z))
+
+    def __mul__(self, scalar):
+        return MeshVector((self.x * scalar, self.y * scalar, self.z * scalar))
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def copy(self):
+        return MeshVector(self)
+
+    def cross(self, other):
+        return MeshVector((
+            self.y * other.z - self.z * other.y,
+            self.z * other.x - self.x * other.z,
+            self.x * other.y - self.y * other.x,
+        ))
+
+    def normalized(self):
+        length = sum(c * c for c in self) ** 0.5
+        return self * (1.0 / length)
+
+
+class MeshMatrix:
+    """Affine 4x4 matrix stored as a 3x3 part and a translation."""
+
+    def __init__(self, rows, translation=(0.0, 0.0, 0.0)):
+        self.rows = [list(row) for row in rows]
+        self.translation = MeshVector(translation)
+
+    def to_4x4(self):
+        return self
+
+    def copy(self):
+        return MeshMatrix(self.rows, self.translation)
+
+    def invert(self):
+        (a, b, c), (d, e, f), (g, h, i) = self.rows
+        det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+        self.rows = [
+            [(e * i - f * h) / det, (c * h - b * i) / det, (b * f - c * e) / det],
+            [(f * g - d * i) / det, (a * i - c * g) / det, (c * d - a * f) / det],
+            [(d * h - e * g) / det, (b * g - a * h) / det, (a * e - b * d) / det],
+        ]
+        self.translation = self.rotate(self.translation) * -1.0
+
+    def rotate(self, v):
+        return MeshVector(sum(r * c for r, c in zip(row, v)) for row in self.rows)
+
+    def __matmul__(self, v):
+        return self.rotate(v) + self.translation
+
+
+class MeshVert:
+    def __init__(self, co):
+        self.co = MeshVector(co)
+        self.link_faces = []
+
+
+class MeshFace:
+    def __init__(self, verts, layers=None):
+        self.verts = verts
+        self.edges = list(zip(verts, verts[1:] + verts[:1]))
+        self.is_valid = True
+        self.material_index = 0
+        self.layers = dict(layers or {})
+
+    def __getitem__(self, layer):
+        return self.layers.get(layer, 0)
+
+    def __setitem__(self, layer, value):
+        self.layers[layer] = value
+
+    @property
+    def normal(self):
+        n = [0.0, 0.0, 0.0]
+        for a, b in self.edges:
+            n[0] += (a.co.y - b.co.y) * (a.co.z + b.co.z)
+            n[1] += (a.co.z - b.co.z) * (a.co.x + b.co.x)
+            n[2] += (a.co.x - b.co.x) * (a.co.y + b.co.y)
+        return MeshVector(n).normalized()
+
+
+class MeshLayers:
+    def __init__(self):
+        self.int = self
+
+    def new(self, name):
+        return object()
+
+    def remove(self, layer):
+        pass
+
+
+class MeshFaces(list):
+    layers = MeshLayers()
+
+
+class FakeBMesh:
+    def __init__(self, quads):
+        self.verts = []
+        self.faces = MeshFaces()
+        for quad in quads:
+            self.add_face([self.add_vert(co) for co in quad])
+
+    def add_vert(self, co):
+        vert = MeshVert(co)
+        self.verts.append(vert)
+        return vert
+
+    def add_face(self, verts, layers=None):
+        face = MeshFace(verts, layers)
+        for vert in verts:
+            vert.link_faces.append(face)
+        self.faces.append(face)
+        return face
+
+    def kill_face(self, face):
+        face.is_valid = False
+        self.faces.remove(face)
+
+    def snapshot(self):
+        return [([tuple(round(c, 9) for c in v.co) for v in f.verts], f.material_index) for f in self.faces]
+
+
+class FakeOps:
+    """The ``bmesh.ops`` calls made by the extrusion helpers."""
+
+    @staticmethod
+    def extrude_discrete_faces(bm, faces):
+        new_faces = []
+        for face in faces:
+            verts = [bm.add_vert(v.co) for v in face.verts]
+            new_faces.append(bm.add_face(verts, face.layers))
+            for (a, b), (c, d) in zip(face.edges, zip(verts, verts[1:] + verts[:1])):
+                bm.add_face([a, b, d, c])
+            bm.kill_face(face)
+        # Like BMesh, hand the copies back in an order unrelated to the input.
+        return {"faces": new_faces[::-1]}
+
+    @staticmethod
+    def translate(bm, vec, verts):
+        for vert in verts:
+            vert.co = vert.co + vec
+
+    @staticmethod
+    def scale(bm, vec, space, verts):
+        to_world = space.copy()
+        to_world.invert()
+        for vert in verts:
+            local = space @ vert.co
+            vert.co = to_world @ MeshVector((local.x * vec.x, local.y * vec.y, local.z * vec.z))
+
+    @staticmethod
+    def subdivide_edges(bm, edges, cuts, fractal, use_grid_fill, use_single_edge):
+        face = next(f for f in bm.faces if f.edges == edges)
+        a, b, c, d = (v.co for v in face.verts)
+        n = cuts + 1
+
+        def point(i, j):
+            u, v = i / n, j / n
+            return (a * (1 - u) + b * u) * (1 - v) + (d * (1 - u) + c * u) * v
+
+        grid = [[bm.add_vert(point(i, j)) for i in range(n + 1)] for j in range(n + 1)]
+        cells = [
+            bm.add_face([grid[j][i], grid[j][i + 1], grid[j + 1][i + 1], grid[j + 1][i]])
+            for j in range(n) for i in range(n)
+        ]
+        bm.kill_face(face)
+        return {"geom": cells + [v for row in grid for v in row]}
+
+
+@pytest.fixture
+def fake_bmesh(monkeypatch):
+    module = types.SimpleNamespace(ops=FakeOps, types=types.SimpleNamespace(BMFace=MeshFace))
+    monkeypatch.setattr(geometry, "bmesh", module)
+    monkeypatch.setattr(geometry, "Vector", MeshVector)
+    monkeypatch.setattr(geometry, "Matrix", MeshMatrix)
+
+
+QUADS = [
+    [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+    [(1, 0, 0), (1, 0, 1), (1, 1, 1), (1, 1, 0)],
+    [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+    [(0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1)],
+]
+
+
+def test_extrude_faces_matches_extruding_one_face_at_a_time(fake_bmesh):
+    distances = [0.1, 0.2, 0.5, 0.3]
+    scales = [0.8, 1.0, 0.5, 1.25]
+
+    bm = FakeBMesh(QUADS)
+    expected = []
+    for face, distance, scale in zip(list(bm.faces), distances, scales):
+        new_face = geometry.extrude_face(bm, face, distance)
+        geometry.scale_face(bm, new_face, scale, scale, scale)
+        expected.append(new_face)
+    expected = [[tuple(round(c, 9) for c in v.co) for v in f.verts] for f in expected]
+
+    batched = FakeBMesh(QUADS)
+    new_faces = geometry.extrude_faces(batched, list(batched.faces), distances, scales)
+
+    # The first and third quads coincide, so only their tags tell them apart.
+    assert [[tuple(round(c, 9) for c in v.co) for v in f.verts] for f in new_faces] == expected
+    assert batched.snapshot() == bm.snapshot()
+
+
+def test_add_grid_to_faces_matches_add_grid_to_face(fake_bmesh):
+    random.seed(7)
+    bm = FakeBMesh(QUADS)
+    for face in list(bm.faces):
+        geometry.add_grid_to_face(bm, face)
+
+    random.seed(7)
+    batched = FakeBMesh(QUADS)
+    geometry.add_grid_to_faces(batched, list(batched.faces))
+
+    assert batched.snapshot() == bm.snapshot()
+    assert {index for _, index in bm.snapshot()} != {0}
+
+
+def test_interleaved_generators_keep_their_own_face_metrics():
+    @geometry.cached_face_metrics
+    def measure(face, edges):
+        first = geometry.get_aspect_ratio(face)
+        yield
+        edges[0]._length = 2.0
+        geometry.invalidate_face_metrics([face])
+        yield
+        return first, geometry.get_aspect_ratio(face)
+
+    def make_face():
+        edges = [Edge(4.0), Edge(1.0)]
+        return Face([Vert(geometry.Vector((0, 0, 0)))] * 4, edges, geometry.Vector((0, 0, 1))), edges
+
+    a = measure(*make_face())
+    b = measure(*make_face())
+    next(a)
+    next(b)
+    next(a)
+    assert geometry._face_metrics is None
+    for _ in b:
+        pass
+    with pytest.raises(StopIteration) as done:
+        next(a)
+
+    assert done.value.value == (4.0, 2.0)
+    assert geometry._face_metrics is None
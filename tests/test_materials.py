@@ -0,0 +1,23 @@
+"""Tests for material helpers that do not require Blender."""
+
+import random
+
+import pytest
+
+from spaceship_generator.materials import dark_hull_color, random_hull_color
+
+
+def test_random_hull_color_draws_like_create_materials():
+    random.seed("movie")
+    color = random_hull_color()
+    after = random.random()
+
+    random.seed("movie")
+    random.random(), random.uniform(0.05, 0.5), random.uniform(0, 0.25)
+    assert random.random() == after
+    assert len(color) == 4 and color[3] == 1.0
+    assert all(0.0 <= c <= 1.0 for c in color)
+
+
+def test_dark_hull_color():
+    assert dark_hull_color((0.5, 0.2, 1.0, 1.0)) == pytest.approx((0.05, 0.02, 0.1, 1.0))
@@ -0,0 +1,120 @@
+"""Tests for the flat array mesh representation."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spaceship_generator.meshdata import MeshData
+
+
+class FakeCollection:
+    def __init__(self):
+        self.count = 0
+        self.values = {}
+
+    def add(self, count):
+        self.count += count
+
+    def foreach_set(self, attr, seq):
+        self.values[attr] = list(seq)
+
+
+class FakeMesh:
+    def __init__(self):
+        self.vertices = FakeCollection()
+        self.loops = FakeCollection()
+        self.polygons = FakeCollection()
+        self.cleared = False
+        self.updated = False
+
+    def clear_geometry(self):
+        self.cleared = True
+
+    def update(self, calc_edges=False):
+        self.updated = calc_edges
+
+
+def _quad_and_triangle():
+    vertices = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0)]
+    return MeshData(vertices, [4, 3], [0, 1, 2, 3, 1, 4, 2], [0, 3])
+
+
+def test_face_starts():
+    assert list(_quad_and_triangle().face_starts) == [0, 4]
+
+
+def test_to_mesh_copies_flat_arrays():
+    mesh = _quad_and_triangle().to_mesh(FakeMesh())
+
+    assert mesh.cleared and mesh.updated
+    assert mesh.vertices.count == 5
+    assert mesh.vertices.values["co"][3:6] == [1, 0, 0]
+    assert mesh.loops.values["vertex_index"] == [0, 1, 2, 3, 1, 4, 2]
+    assert mesh.polygons.count == 2
+    assert mesh.polygons.values["loop_start"] == [0, 4]
+    assert mesh.polygons.values["loop_total"] == [4, 3]
+    assert mesh.polygons.values["material_index"] == [0, 3]
+
+
+def _unit_cube():
+    vertices = [(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)]
+    faces = [
+        (0, 1, 3, 2),  # -X
+        (4, 6, 7, 5),  # +X
+        (0, 4, 5, 1),  # -Y
+        (2, 3, 7, 6),  # +Y
+        (0, 2, 6, 4),  # -Z
+        (1, 5, 7, 3),  # +Z
+    ]
+    return MeshData(vertices, [4] * 6, [i for f in faces for i in f])
+
+
+def test_face_normals():
+    normals = _unit_cube().face_normals()
+
+    expected = [(-1, 0, 0), (1, 0, 0), (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1)]
+    assert np.allclose(normals, expected)
+
+
+def test_cube_project_uvs_follow_box_mapping():
+    data = _unit_cube()
+    uvs = data.cube_project_uvs().reshape(6, 4, 2)
+    corners = data.vertices[data.face_vertices].reshape(6, 4, 3)
+
+    assert np.allclose(uvs[1], corners[1][:, [1, 2]])  # +X: (y, z)
+    assert np.allclose(uvs[0, :, 0], 1 - corners[0][:, 1])  # -X flips u
+    assert np.allclose(uvs[2], corners[2][:, [0, 2]])  # -Y: (x, z)
+    assert np.allclose(uvs[5, :, 0], 1 - corners[5][:, 1])  # +Z flips u
+    assert np.allclose(uvs[5, :, 1], corners[5][:, 0])
+
+
+def test_split_normals_keep_hard_edges():
+    data = _unit_cube()
+
+    hard = data.split_normals(30.0)
+    assert np.allclose(hard, data.face_normals()[data.loop_faces])
+
+
+def test_split_normals_smooth_corners():
+    data = _unit_cube()
+
+    smooth = data.split_normals(180.0)
+    corners = data.vertices[data.face_vertices] - 0.5
+    expected = corners / np.linalg.norm(corners, axis=1, keepdims=True)
+    assert np.allclose(smooth, expected, atol=1e-6)
+
+
+def test_save_meshes_keeps_uvs_of_mixed_meshes(tmp_path):
+    from spaceship_generator.meshdata import load_meshes, save_meshes
+
+    plain = _quad_and_triangle()
+    textured = _quad_and_triangle()
+    textured.uvs = np.arange(14, dtype=np.float32).reshape(7, 2)
+    path = str(tmp_path / "meshes.npz")
+    save_meshes(path, ["a", "b", "c"], [textured, plain, textured])
+
+    meshes = load_meshes(path)
+    assert meshes["b"].uvs is None
+    for name in "ac":
+        assert np.array_equal(meshes[name].uvs, textured.uvs)
+        assert np.array_equal(meshes[name].face_vertices, textured.face_vertices)
@@ -0,0 +1,116 @@
+"""Tests for the add-on's operators using stubbed Blender modules."""
+
+import importlib.util
+import pathlib
+import random
+import sys
+import types
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def addon():
+    spec = importlib.util.spec_from_file_location(
+        "spaceship_addon", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+        yield module
+    finally:
+        for name in [n for n in sys.modules if n == spec.name or n.startswith(spec.name + ".")]:
+            del sys.modules[name]
+
+
+class FakeWindowManager:
+    def __init__(self):
+        self.timers = []
+        self.progress = None
+
+    def event_timer_add(self, interval, window=None):
+        self.timers.append(object())
+        return self.timers[-1]
+
+    def event_timer_remove(self, timer):
+        self.timers.remove(timer)
+
+    def progress_begin(self, low, high):
+        self.progress = low
+
+    def progress_update(self, value):
+        self.progress = value
+
+    def progress_end(self):
+        self.progress = None
+
+    def modal_handler_add(self, operator):
+        pass
+
+
+def _context():
+    return types.SimpleNamespace(window_manager=FakeWindowManager(), window=None, area=None)
+
+
+def _event(event_type):
+    return types.SimpleNamespace(type=event_type)
+
+
+def _fake_steps(log, num_steps):
+    def iter_generate_spaceship(random_seed):
+        log.append(("start", random_seed))
+        try:
+            for _ in range(num_steps):
+                random.random()
+                yield "hull"
+            return types.SimpleNamespace(location=types.SimpleNamespace(x=None))
+        finally:
+            log.append(("closed", random_seed))
+
+    return iter_generate_spaceship
+
+
+def _operator(addon, **props):
+    operator = addon.GenerateSpaceshipFleet()
+    operator.random_seed = "ship"
+    operator.num_ships = 2
+    operator.spacing = 8.0
+    operator.time_budget_ms = 1000
+    for name, value in props.items():
+        setattr(operator, name, value)
+    return operator
+
+
+def test_fleet_operator_steps_until_every_ship_is_done(addon, monkeypatch):
+    log = []
+    monkeypatch.setattr(addon.spaceship_generator, "iter_generate_spaceship", _fake_steps(log, 3))
+    context = _context()
+    operator = _operator(addon)
+
+    assert operator.execute(context) == {'RUNNING_MODAL'}
+    assert operator.modal(context, _event('MOUSEMOVE')) == {'PASS_THROUGH'}
+    state = random.getstate()
+    assert operator.modal(context, _event('TIMER')) == {'FINISHED'}
+
+    assert random.getstate() == state
+    assert log == [("start", "ship0"), ("closed", "ship0"), ("start", "ship1"), ("closed", "ship1")]
+    assert context.window_manager.timers == [] and context.window_manager.progress is None
+
+
+def test_fleet_operator_cancel_closes_the_current_ship(addon, monkeypatch):
+    log = []
+    monkeypatch.setattr(addon.spaceship_generator, "iter_generate_spaceship", _fake_steps(log, 10 ** 9))
+    context = _context()
+    operator = _operator(addon, time_budget_ms=1)
+
+    operator.execute(context)
+    assert operator.modal(context, _event('TIMER')) == {'PASS_THROUGH'}
+    assert log == [("start", "ship0")]
+
+    assert operator.modal(context, _event('ESC')) == {'CANCELLED'}
+    assert log == [("start", "ship0"), ("closed", "ship0")]
+    assert operator._steps is None
+    assert context.window_manager.timers == [] and context.window_manager.progress is None
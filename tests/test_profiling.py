@@ -0,0 +1,48 @@
+"""Tests for memory profiling that do not require Blender."""
+
+import json
+
+import pytest
+
+from spaceship_generator.profiling import JsonLinesSink, MemoryProfiler
+
+
+class FakeBMesh:
+    verts = [0] * 8
+    edges = [0] * 12
+    faces = [0] * 6
+
+
+def test_record_includes_element_counts_and_context():
+    received = []
+    with MemoryProfiler(sink=received.append, job="fleet-1") as profiler:
+        record = profiler.record("hull", FakeBMesh(), seed="42")
+
+    assert received == [record]
+    assert record["stage"] == "hull"
+    assert record["job"] == "fleet-1"
+    assert record["seed"] == "42"
+    assert (record["verts"], record["edges"], record["faces"]) == (8, 12, 6)
+    assert record["peak_bytes"] >= record["current_bytes"] >= 0
+
+
+def test_json_lines_sink(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    with MemoryProfiler(sink=JsonLinesSink(str(path))) as profiler:
+        profiler.record("hull")
+        profiler.record("detail")
+
+    stages = [json.loads(line)["stage"] for line in path.read_text().splitlines()]
+    assert stages == ["hull", "detail"]
+
+
+def test_record_requires_a_running_profiler():
+    profiler = MemoryProfiler()
+    with pytest.raises(RuntimeError):
+        profiler.record("hull")
+
+    with profiler:
+        profiler.record("hull")
+    with pytest.raises(RuntimeError):
+        profiler.record("detail")
+    assert [r["stage"] for r in profiler.records] == ["hull"]
@@ -0,0 +1,54 @@
+"""Tests for the seed descriptor index."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spaceship_generator import seedindex  # noqa: E402
+from spaceship_generator.cli import parse_range  # noqa: E402
+
+
+def _describe(random_seed, params):
+    n = int(random_seed)
+    descriptors = {
+        "extent_x": 1.0 + n,
+        "extent_y": 1.0,
+        "extent_z": 2.0,
+        "num_vertices": 8 * n,
+        "num_faces": 6 * n,
+    }
+    if (params or {}).get("create_face_detail", True):
+        descriptors.update(engines=n % 4, grids=1, antennas=0, weapons=n % 2, spheres=0, discs=0, cylinders=2)
+    return descriptors
+
+
+def test_query_combines_ranges():
+    index = seedindex.build_seed_index(range(10), describe=_describe)
+
+    assert len(index) == 10
+    assert np.allclose(index.columns["slenderness"], (1.0 + np.arange(10)) / 2.0)
+    assert list(index.query(slenderness=(3, None), engines=(2, None), weapons=(0, 0))) == [6]
+    assert list(index.query(num_faces=(None, 12))) == [0, 1, 2]
+    with pytest.raises(KeyError):
+        index.query(wings=(1, None))
+
+
+def test_missing_detail_counts_are_zero():
+    index = seedindex.build_seed_index(range(3), {"create_face_detail": False}, describe=_describe)
+    assert not index.columns["engines"].any()
+
+
+def test_save_and_load(tmp_path):
+    index = seedindex.build_seed_index(range(5, 10), describe=_describe)
+    path = str(tmp_path / "seeds.npz")
+    index.save(path)
+    loaded = seedindex.SeedIndex.load(path)
+
+    assert list(loaded.seeds) == [5, 6, 7, 8, 9]
+    assert list(loaded.query(weapons=(1, 1))) == [5, 7, 9]
+
+
+def test_parse_range():
+    assert parse_range("engines=2:") == ("engines", (2.0, None))
+    assert parse_range("weapons=0") == ("weapons", (0.0, 0.0))
+    assert parse_range("extent_x=:1.5") == ("extent_x", (None, 1.5))
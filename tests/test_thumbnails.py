@@ -0,0 +1,88 @@
+"""Tests for the NumPy thumbnail rasterizer."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spaceship_generator.materials import Material  # noqa: E402
+from spaceship_generator.meshdata import MeshData  # noqa: E402
+from spaceship_generator.thumbnails import (  # noqa: E402
+    MATERIAL_COLORS,
+    contact_sheet,
+    mirror,
+    render_thumbnail,
+    save_png,
+)
+
+
+# Shading of a polygon facing the camera.
+FACING = 0.35 + 0.65 * 0.81
+
+
+def _cube(material=Material.hull):
+    vertices = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    faces = [
+        (0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1),
+        (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3),
+    ]
+    return MeshData(vertices, [4] * 6, [i for f in faces for i in f], [material] * 6)
+
+
+def test_render_thumbnail_covers_the_mesh():
+    image = render_thumbnail(_cube(), size=32, margin=0)
+
+    assert image.shape == (32, 32, 3) and image.dtype == np.uint8
+    # A cube seen face on fills the whole frame with the hull color.
+    assert (image[..., 0] > 20).all()
+    assert np.allclose(image[16, 16] / 255.0, np.array(MATERIAL_COLORS[Material.hull]) * FACING, atol=0.01)
+
+
+def test_render_thumbnail_keeps_nearest_polygon():
+    near = _cube(Material.glow_disc)
+    far = MeshData(near.vertices * 0.5 + (0, 5, 0), near.face_sizes, near.face_vertices)
+    data = MeshData(
+        np.concatenate([far.vertices, near.vertices]),
+        np.concatenate([far.face_sizes, near.face_sizes]),
+        np.concatenate([far.face_vertices, near.face_vertices + far.num_vertices]),
+        np.concatenate([far.material_indices, near.material_indices]),
+    )
+    image = render_thumbnail(data, size=32, view="side", background=(0, 0, 0))
+    expected = np.rint(np.array(MATERIAL_COLORS[Material.glow_disc]) * FACING * 255)
+    assert np.allclose(image[16, 16], expected, atol=1)
+
+
+def test_mirror_reflects_and_reverses_winding():
+    half = MeshData([(1, 0, 0), (2, 0, 0), (2, 1, 0)], [3], [0, 1, 2])
+    data = mirror(half)
+
+    assert data.num_faces == 2
+    assert np.allclose(data.vertices[3:, 0], [-1, -2, -2])
+    assert np.allclose(data.face_normals(), [(0, 0, 1), (0, 0, 1)])
+
+
+def test_contact_sheet_and_png(tmp_path):
+    images = [render_thumbnail(_cube(), size=16)] * 5
+    sheet = contact_sheet(images, padding=1)
+    assert sheet.shape == (3 * 17 + 1 - 17, 3 * 17 + 1, 3)
+
+    path = tmp_path / "sheet.png"
+    save_png(str(path), sheet)
+    assert path.read_bytes().startswith(b"\x89PNG")
+
+
+def test_render_thumbnail_of_many_small_polygons():
+    # A ship's worth of small polygons: a 50 x 50 grid of quads.
+    n = 50
+    grid = np.stack(np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij"), axis=-1).reshape(-1, 2)
+    vertices = np.column_stack([grid[:, 0], np.sin(grid[:, 1]), grid[:, 1]])
+    corners = np.array([0, n + 1, n + 2, 1])
+    first = (np.arange(n)[:, None] * (n + 1) + np.arange(n)[None, :]).ravel()
+    data = MeshData(vertices, [4] * n * n, (first[:, None] + corners).ravel(), np.arange(n * n) % len(Material))
+
+    image = render_thumbnail(data, size=64, background=(0, 0, 0))
+
+    assert image.shape == (64, 64, 3) and image.dtype == np.uint8
+    assert np.array_equal(image, render_thumbnail(data, size=64, background=(0, 0, 0)))
+    # The grid fills the frame apart from the margin, with every material showing.
+    assert image[2:-2, 2:-2].any(axis=-1).mean() > 0.9
+    assert len(np.unique(image.reshape(-1, 3), axis=0)) > len(Material)